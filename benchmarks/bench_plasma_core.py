@@ -0,0 +1,225 @@
+"""Benchmarks for plasma_core hot paths.
+
+Runs without a network or deployed contracts and writes one JSON object
+per benchmark, for example:
+
+    python -m benchmarks.bench_plasma_core --sizes 1,64,1024 --output results.jsonl
+"""
+
+import argparse
+import sys
+import rlp
+from ethereum.tools import tester
+from plasma_core.block import Block
+from plasma_core.block_view import BlockView
+from plasma_core.child_chain import ChildChain
+from plasma_core.fixed_merkle import FixedMerkle
+from plasma_core.proof_cache import ProofCache
+from plasma_core.transaction import Transaction
+from plasma_core.utils import hashing
+from plasma_core.utils.address import address_to_hex
+from benchmarks.harness import measure, report
+
+
+DEFAULT_SIZES = [1, 16, 256, 1024]
+MERKLE_DEPTH = 10
+MERKLE_NODE_SIZE = 64
+
+
+def copy_transaction(tx):
+    """Returns a copy of a transaction without any of its cached values"""
+    return Transaction.deserialize(Transaction.serialize(tx))
+
+
+def make_leaves(size):
+    return [i.to_bytes(32, 'big') for i in range(size)]
+
+
+def make_spends(size):
+    """Creates signed transactions spending deposits in blocks 1 to size"""
+    spends = []
+    for blknum in range(1, size + 1):
+        tx = Transaction(inputs=[(blknum, 0, 0)], outputs=[(tester.a1, 1)])
+        tx.sign(0, tester.k0)
+        spends.append(tx)
+    return spends
+
+
+def bench_fixed_merkle(sizes, repeat):
+    results = []
+    for size in sizes:
+        leaves = make_leaves(size)
+        for sparse in (False, True):
+            params = {'leaves': size, 'depth': MERKLE_DEPTH, 'sparse': sparse}
+            results.append(measure('fixed_merkle.build', params,
+                                   lambda: FixedMerkle(MERKLE_DEPTH, leaves, sparse=sparse),
+                                   repeat=repeat))
+
+        merkle = FixedMerkle(MERKLE_DEPTH, leaves, sparse=True)
+        proofs = [merkle.create_membership_proof(leaf) for leaf in leaves]
+        params = {'leaves': size, 'depth': MERKLE_DEPTH}
+        results.append(measure('fixed_merkle.create_membership_proof', params,
+                               lambda: [merkle.create_membership_proof(leaf) for leaf in leaves],
+                               repeat=repeat, items=size))
+        results.append(measure('fixed_merkle.check_membership', params,
+                               lambda: [merkle.check_membership(leaf, i, proof) for i, (leaf, proof) in enumerate(zip(leaves, proofs))],
+                               repeat=repeat, items=size))
+
+        indices = list(range(size))
+        multiproof = merkle.create_multiproof(indices)
+        results.append(measure('fixed_merkle.create_multiproof', dict(params, proof_bytes=len(multiproof)),
+                               lambda: merkle.create_multiproof(indices),
+                               repeat=repeat, items=size))
+        results.append(measure('fixed_merkle.check_multiproof', params,
+                               lambda: merkle.check_multiproof(leaves, indices, multiproof),
+                               repeat=repeat, items=size))
+    return results
+
+
+def bench_hashing(sizes, repeat):
+    results = []
+    for name in hashing.get_available_backends():
+        backend = hashing.load_backend(name)
+        for size in sizes:
+            # Merkle nodes are the hash of two concatenated 32 byte children.
+            nodes = [i.to_bytes(MERKLE_NODE_SIZE, 'big') for i in range(size)]
+            params = {'backend': name, 'inputs': size, 'input_bytes': MERKLE_NODE_SIZE}
+            results.append(measure('hashing.keccak', params,
+                                   lambda: [backend.keccak(node) for node in nodes],
+                                   repeat=repeat, items=size))
+            results.append(measure('hashing.keccak_batch', params,
+                                   lambda: backend.keccak_batch(nodes),
+                                   repeat=repeat, items=size))
+    return results
+
+
+def bench_transaction(sizes, repeat):
+    results = []
+    for size in sizes:
+        params = {'transactions': size}
+        unsigned = [Transaction(inputs=[(blknum, 0, 0)], outputs=[(tester.a1, 1)]) for blknum in range(1, size + 1)]
+        results.append(measure('transaction.sign', params,
+                               lambda txs: [tx.sign(0, tester.k0) for tx in txs],
+                               setup=lambda: [copy_transaction(tx) for tx in unsigned],
+                               repeat=repeat, items=size))
+
+        signed = make_spends(size)
+        results.append(measure('transaction.signers', dict(params, cached=False),
+                               lambda txs: [tx.signers for tx in txs],
+                               setup=lambda: [copy_transaction(tx) for tx in signed],
+                               repeat=repeat, items=size))
+        # Warm up the signer cache before timing cached lookups.
+        [tx.signers for tx in signed]
+        results.append(measure('transaction.signers', dict(params, cached=True),
+                               lambda: [tx.signers for tx in signed],
+                               repeat=repeat, items=size))
+    return results
+
+
+def bench_block(sizes, repeat):
+    results = []
+    for size in sizes:
+        spends = make_spends(size)
+
+        def fresh_block():
+            return Block(transactions=[copy_transaction(tx) for tx in spends], number=size + 1)
+
+        warm_block = fresh_block()
+        for name in ('hash', 'root'):
+            params = {'transactions': size}
+            getattr(warm_block, name)
+            results.append(measure('block.{0}'.format(name), dict(params, cached=False),
+                                   lambda block: getattr(block, name),
+                                   setup=fresh_block,
+                                   repeat=repeat, items=size))
+            results.append(measure('block.{0}'.format(name), dict(params, cached=True),
+                                   lambda: getattr(warm_block, name),
+                                   repeat=repeat, items=size))
+
+        encoded = rlp.encode(warm_block)
+        params = {'transactions': size}
+        results.append(measure('block.decode_transaction', dict(params, lazy=False),
+                               lambda: Block.deserialize(rlp.decode(encoded)).transactions[size // 2],
+                               repeat=repeat))
+        results.append(measure('block.decode_transaction', dict(params, lazy=True),
+                               lambda: BlockView(encoded).transactions[size // 2],
+                               repeat=repeat))
+    return results
+
+
+def bench_child_chain(sizes, repeat):
+    results = []
+    operator = address_to_hex(tester.a0)
+    for size in sizes:
+        spends = make_spends(size)
+        template = Block(transactions=spends, number=size + 1)
+        template.sign(tester.k0)
+
+        def setup():
+            child_chain = ChildChain(operator)
+            for blknum in range(1, size + 1):
+                deposit_tx = Transaction(inputs=[], outputs=[(tester.a0, 1)])
+                child_chain.add_block(Block(transactions=[deposit_tx], number=blknum))
+            block = Block(transactions=[copy_transaction(tx) for tx in spends], number=size + 1, signature=template.signature)
+            return (child_chain, block)
+
+        results.append(measure('child_chain.add_block', {'transactions': size},
+                               lambda args: args[0].add_block(args[1]),
+                               setup=setup,
+                               repeat=repeat, items=size))
+    return results
+
+
+def bench_proof_cache(sizes, repeat):
+    results = []
+    for size in sizes:
+        spends = make_spends(size)
+        block = Block(transactions=spends, number=size + 1)
+        child_chain = ChildChain(address_to_hex(tester.a0))
+        child_chain.storage.commit_block(block, {}, {}, block.number + 1)
+        params = {'transactions': size}
+
+        results.append(measure('proof_cache.get_proof', dict(params, cached=False),
+                               lambda proofs: [proofs.get_proof(block.number, txindex) for txindex in range(size)],
+                               setup=lambda: ProofCache(child_chain),
+                               repeat=repeat, items=size))
+        warm = ProofCache(child_chain)
+        warm.precompute(block)
+        results.append(measure('proof_cache.get_proof', dict(params, cached=True),
+                               lambda: [warm.get_proof(block.number, txindex) for txindex in range(size)],
+                               repeat=repeat, items=size))
+    return results
+
+
+BENCHMARKS = [
+    ('hashing', bench_hashing),
+    ('fixed_merkle', bench_fixed_merkle),
+    ('transaction', bench_transaction),
+    ('block', bench_block),
+    ('child_chain', bench_child_chain),
+    ('proof_cache', bench_proof_cache),
+]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark plasma_core hot paths.')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='comma separated numbers of leaves or transactions to benchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per benchmark')
+    parser.add_argument('--only', action='append', help='only run benchmark groups with this name')
+    parser.add_argument('--output', help='file to write JSON lines to, defaults to stdout')
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    results = []
+    for name, bench in BENCHMARKS:
+        if args.only and name not in args.only:
+            continue
+        sys.stderr.write('running {0} benchmarks\n'.format(name))
+        results += bench(sizes, args.repeat)
+
+    report(results, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+"""Gas benchmarks for RootChain entry points.
+
+Deploys RootChain to a new tester chain for each scenario, drives it
+through TestingLanguage and records the gas used by each measured call,
+including the intrinsic transaction cost. Writes one JSON object per
+measurement, for example:
+
+    python -m benchmarks.bench_root_chain_gas --output gas.jsonl
+
+Passing a previous report with --baseline prints the change for every
+measurement found in both reports.
+"""
+
+import argparse
+import json
+import sys
+from ethereum.tools import tester
+from plasma_core.constants import WEEKS
+from plasma_core.utils.transactions import encode_utxo_position
+from testlang.testlang import TestingLanguage
+from testlang.tester_chain import GAS_LIMIT, deployer, setup_accounts, deploy_root_chain
+from benchmarks.harness import report
+
+
+DEFAULT_QUEUE_DEPTHS = [0, 16, 64]
+DEFAULT_EXIT_COUNTS = [1, 8, 32]
+DEFAULT_BLOCK_SIZE = 16
+
+
+def new_testlang():
+    """Deploys RootChain to a new chain"""
+    tester.chain = tester.Chain()
+    setup_accounts(tester)
+    return TestingLanguage(deploy_root_chain(tester.chain), tester)
+
+
+def ensure_block_space(testlang):
+    """Mines the current block if another transaction might not fit in it"""
+    chain = testlang.ethtester.chain
+    if chain.head_state.gas_used + tester.STARTGAS > GAS_LIMIT:
+        chain.mine()
+
+
+def measure_gas(testlang, name, params, func):
+    """Records the gas used by the last transaction sent by a function.
+
+    Every scenario measures a call that should succeed, so a failed call
+    raises instead of reporting the gas of a reverted transaction.
+
+    Args:
+        testlang (TestingLanguage): Testing language the function uses.
+        name (str): Name of the benchmark.
+        params (dict): Parameters the scenario was set up with.
+        func (function): Function that sends the transaction to measure.
+
+    Returns:
+        dict: Machine-readable benchmark result.
+    """
+
+    ensure_block_space(testlang)
+    try:
+        func()
+    except tester.TransactionFailed as e:
+        raise RuntimeError('benchmark {0} {1} failed'.format(name, json.dumps(params, sort_keys=True))) from e
+
+    return {
+        'benchmark': name,
+        'params': params,
+        'gas': testlang.ethtester.chain.last_gas_used(with_tx=True),
+    }
+
+
+def start_exits(testlang, count):
+    """Creates deposits and starts an exit from each of them"""
+    owner = testlang.accounts[0]
+    for _ in range(count):
+        ensure_block_space(testlang)
+        deposit_blknum = testlang.deposit(owner, 100)
+        ensure_block_space(testlang)
+        testlang.start_exit(owner, encode_utxo_position(deposit_blknum, 0, 0))
+
+
+def bench_deposit(args):
+    testlang = new_testlang()
+    owner = testlang.accounts[0]
+    return [measure_gas(testlang, 'root_chain.deposit', {}, lambda: testlang.deposit(owner, 100))]
+
+
+def bench_commit_plasma_block_root(args):
+    testlang = new_testlang()
+    return [measure_gas(testlang, 'root_chain.commitPlasmaBlockRoot', {},
+                        lambda: testlang.root_chain.commitPlasmaBlockRoot(b'\x01' * 32, sender=testlang.operator.key))]
+
+
+def bench_start_exit(args):
+    results = []
+
+    # Exits are inserted into a priority queue, so their cost depends on how many exits are already queued.
+    for depth in args.queue_depths:
+        testlang = new_testlang()
+        owner = testlang.accounts[0]
+        start_exits(testlang, depth)
+        deposit_blknum = testlang.deposit(owner, 100)
+        results.append(measure_gas(testlang, 'root_chain.startExit', {'queue_depth': depth},
+                                   lambda: testlang.start_exit(owner, encode_utxo_position(deposit_blknum, 0, 0))))
+
+    # The proof always has the same length, but its contents depend on the transaction's position.
+    block_size = args.block_size
+    for txindex in sorted({0, block_size // 2, block_size - 1}):
+        testlang = new_testlang()
+        owner = testlang.accounts[0]
+        for _ in range(block_size):
+            ensure_block_space(testlang)
+            deposit_blknum = testlang.deposit(owner, 100)
+            testlang.submit_transaction([(deposit_blknum, 0, 0)], [(owner, 100)], [owner])
+        ensure_block_space(testlang)
+        block = testlang.commit_mempool_block()
+        utxo_position = encode_utxo_position(block.number, txindex, 0)
+        # Outputs of spends can only be exited once the spend is confirmed.
+        testlang.confirm(utxo_position, 0, owner)
+        results.append(measure_gas(testlang, 'root_chain.startExit', {'block_size': block_size, 'txindex': txindex},
+                                   lambda: testlang.start_exit(owner, utxo_position)))
+    return results
+
+
+def bench_challenge_exit(args):
+    testlang = new_testlang()
+    owner = testlang.accounts[0]
+    deposit_utxo_position = encode_utxo_position(testlang.deposit(owner, 100), 0, 0)
+    testlang.start_exit(owner, deposit_utxo_position)
+    spending_utxo_position = testlang.spend_utxo(deposit_utxo_position, owner, 100, owner)
+    testlang.confirm(spending_utxo_position, 0, owner)
+    return [measure_gas(testlang, 'root_chain.challengeExit', {},
+                        lambda: testlang.challenge_exit(deposit_utxo_position))]
+
+
+def bench_process_exits(args):
+    results = []
+    for count in args.exit_counts:
+        testlang = new_testlang()
+        start_exits(testlang, count)
+        testlang.ethtester.chain.mine()
+        testlang.forward_timestamp(2 * WEEKS)
+
+        result = measure_gas(testlang, 'root_chain.processExits', {'exits': count}, testlang.process_exits)
+        result['gas_per_exit'] = result['gas'] // count
+        results.append(result)
+    return results
+
+
+BENCHMARKS = [
+    ('deposit', bench_deposit),
+    ('commit_plasma_block_root', bench_commit_plasma_block_root),
+    ('start_exit', bench_start_exit),
+    ('challenge_exit', bench_challenge_exit),
+    ('process_exits', bench_process_exits),
+]
+
+
+def get_key(result):
+    """Returns a key that identifies a measurement across reports"""
+    return (result['benchmark'], json.dumps(result['params'], sort_keys=True))
+
+
+def compare(results, baseline_path, output=sys.stderr):
+    """Writes the change in gas for each measurement found in a baseline report.
+
+    Args:
+        results (dict[]): New results.
+        baseline_path (str): Path to a report written by a previous run.
+        output (file): File to write the comparison to.
+    """
+
+    with open(baseline_path, 'r') as baseline_file:
+        baseline = {get_key(result): result for result in map(json.loads, baseline_file) if 'gas' in result}
+
+    for result in results:
+        previous = baseline.get(get_key(result))
+        if previous is None:
+            continue
+        change = result['gas'] - previous['gas']
+        percent = 100.0 * change / previous['gas'] if previous['gas'] else 0.0
+        output.write('{0} {1}: {2} -> {3} ({4:+d}, {5:+.2f}%)\n'.format(
+            result['benchmark'], get_key(result)[1], previous['gas'], result['gas'], change, percent))
+
+
+def parse_sizes(value):
+    return [int(size) for size in value.split(',')]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure gas used by RootChain entry points.')
+    parser.add_argument('--queue-depths', type=parse_sizes, default=DEFAULT_QUEUE_DEPTHS,
+                        help='comma separated numbers of queued exits before the measured startExit')
+    parser.add_argument('--exit-counts', type=parse_sizes, default=DEFAULT_EXIT_COUNTS,
+                        help='comma separated numbers of exits processed by the measured processExits')
+    parser.add_argument('--block-size', type=int, default=DEFAULT_BLOCK_SIZE,
+                        help='number of transactions in the block exited from')
+    parser.add_argument('--only', action='append', help='only run benchmark groups with this name')
+    parser.add_argument('--output', help='file to write JSON lines to, defaults to stdout')
+    parser.add_argument('--baseline', help='previous report to compare the results with')
+    args = parser.parse_args(argv)
+
+    deployer.compile_all()
+
+    results = []
+    for name, bench in BENCHMARKS:
+        if args.only and name not in args.only:
+            continue
+        sys.stderr.write('running {0} benchmarks\n'.format(name))
+        results += bench(args)
+
+    report(results, args.output)
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+import json
+import statistics
+import sys
+import time
+
+
+def measure(name, params, func, setup=None, repeat=5, items=1):
+    """Times repeated calls of a function.
+
+    Args:
+        name (str): Name of the benchmark.
+        params (dict): Parameters the benchmark was run with.
+        func (function): Function to time. Receives the result of setup, if any.
+        setup (function): Optional untimed function called before every run.
+        repeat (int): Number of timed runs.
+        items (int): Number of items processed by a single run, used for throughput.
+
+    Returns:
+        dict: Machine-readable benchmark result.
+    """
+
+    timings = []
+    for _ in range(repeat):
+        args = (setup(),) if setup is not None else ()
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+
+    mean = statistics.mean(timings)
+    return {
+        'benchmark': name,
+        'params': params,
+        'repeat': repeat,
+        'items': items,
+        'mean_s': mean,
+        'median_s': statistics.median(timings),
+        'min_s': min(timings),
+        'max_s': max(timings),
+        'items_per_s': items / mean if mean > 0 else None,
+    }
+
+
+def report(results, output=None):
+    """Writes benchmark results as JSON lines.
+
+    Args:
+        results (dict[]): Results returned by measure.
+        output (str): Optional path to write to, defaults to stdout.
+    """
+
+    lines = ''.join(json.dumps(result, sort_keys=True) + '\n' for result in results)
+    if output is None:
+        sys.stdout.write(lines)
+    else:
+        with open(output, 'w') as output_file:
+            output_file.write(lines)
@@ -27,6 +27,9 @@ library Merkle {
         // Check that the proof length is valid.
         require(_proof.length % 32 == 0);
 
+        // Check that the index is within the tree, otherwise its higher bits would be ignored.
+        require(_index < 2 ** (_proof.length / 32));
+
         // Compute the merkle root.
         bytes32 proofElement;
         bytes32 computedHash = _leaf;
@@ -35,7 +38,7 @@ library Merkle {
             assembly {
                 proofElement := mload(add(_proof, i))
             }
-            if (_index % 2 == 0) {
+            if (index % 2 == 0) {
                 computedHash = keccak256(abi.encodePacked(computedHash, proofElement));
             } else {
                 computedHash = keccak256(abi.encodePacked(proofElement, computedHash));
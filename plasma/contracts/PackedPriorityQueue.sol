@@ -0,0 +1,85 @@
+pragma solidity ^0.4.0;
+
+import "./PriorityQueueLib.sol";
+
+
+/**
+ * @title PackedPriorityQueue
+ * @dev PriorityQueue interface backed by PriorityQueueLib, with batch insertion.
+ */
+contract PackedPriorityQueue {
+    using PriorityQueueLib for PriorityQueueLib.Queue;
+
+    /*
+     *  Storage
+     */
+
+    address owner;
+    PriorityQueueLib.Queue queue;
+
+
+    /*
+     *  Modifiers
+     */
+
+    modifier onlyOwner() {
+        require(msg.sender == owner);
+        _;
+    }
+
+
+    /*
+     * Constructor
+     */
+
+    constructor() public {
+        owner = msg.sender;
+    }
+
+
+    /*
+     * Public functions
+     */
+
+    /**
+     * @dev Returns the number of elements in the priority queue.
+     * @return The number of elements.
+     */
+    function currentSize() public view returns (uint256) {
+        return queue.currentSize();
+    }
+
+    /**
+     * @dev Inserts an element into the priority queue.
+     * @param _priority Priority to insert.
+     * @param _value Some additional value.
+     */
+    function insert(uint256 _priority, uint256 _value) public onlyOwner {
+        queue.insert(_priority, _value);
+    }
+
+    /**
+     * @dev Inserts several elements into the priority queue.
+     * @param _priorities Priority of each element.
+     * @param _values Additional value of each element.
+     */
+    function insertBatch(uint256[] _priorities, uint256[] _values) public onlyOwner {
+        queue.insertBatch(_priorities, _values);
+    }
+
+    /**
+     * @dev Returns the top element of the heap.
+     * @return The smallest element in the priority queue.
+     */
+    function getMin() public view returns (uint256, uint256) {
+        return queue.getMin();
+    }
+
+    /**
+     * @dev Deletes the top element of the heap and shifts everything up.
+     * @return The smallest element in the priorty queue.
+     */
+    function delMin() public onlyOwner returns (uint256, uint256) {
+        return queue.delMin();
+    }
+}
@@ -23,6 +23,9 @@ library PlasmaUtils {
     uint256 constant internal BLOCK_OFFSET = 1000000000;
     uint256 constant internal TX_OFFSET = 10000;
 
+    // Deepest block Merkle tree whose transaction indices all fit between BLOCK_OFFSET and TX_OFFSET.
+    uint256 constant internal MAX_MERKLE_DEPTH = 16;
+
     struct TransactionInput {
         uint256 blknum;
         uint256 txindex;
@@ -124,15 +127,25 @@ library PlasmaUtils {
         return encodeUtxoPosition(_txInput.blknum, _txInput.txindex, _txInput.oindex); 
     }
 
+    /**
+     * @dev Checks that a block Merkle tree depth can be used with the UTXO position encoding.
+     * @param _merkleDepth Depth to check.
+     * @return True if every transaction index fits in a UTXO position, false otherwise.
+     */
+    function isValidMerkleDepth(uint256 _merkleDepth) internal pure returns (bool) {
+        return _merkleDepth > 0 && _merkleDepth <= MAX_MERKLE_DEPTH;
+    }
+
     /**
      * @dev Calculates a deposit root given an encoded deposit transaction.
      * @param _encodedDepositTx RLP encoded deposit transaction.
+     * @param _merkleDepth Depth of the block Merkle tree.
      * @return The deposit root.
      */
-    function getDepositRoot(bytes _encodedDepositTx) internal pure returns (bytes32) {
+    function getDepositRoot(bytes _encodedDepositTx, uint256 _merkleDepth) internal pure returns (bytes32) {
         bytes32 root = keccak256(abi.encodePacked(_encodedDepositTx, new bytes(130)));
         bytes32 zeroHash = keccak256(abi.encodePacked(uint256(0)));
-        for (uint256 i = 0; i < 10; i++) {
+        for (uint256 i = 0; i < _merkleDepth; i++) {
             root = keccak256(abi.encodePacked(root, zeroHash));
             zeroHash = keccak256(abi.encodePacked(zeroHash, zeroHash));
         }
@@ -0,0 +1,190 @@
+pragma solidity ^0.4.0;
+
+
+/**
+ * @title PriorityQueueLib
+ * @dev A priority queue kept in the storage of the contract that uses it.
+ */
+library PriorityQueueLib {
+    /*
+     * Storage
+     */
+
+    /**
+     * @dev Binary min-heap of elements packed as priority << 128 | value.
+     * The heap starts at index 0 and its size is the length of the array.
+     */
+    struct Queue {
+        uint256[] heapList;
+    }
+
+
+    /*
+     * Internal functions
+     */
+
+    /**
+     * @dev Returns the number of elements in the priority queue.
+     * @param _queue Queue to query.
+     * @return The number of elements.
+     */
+    function currentSize(Queue storage _queue) internal view returns (uint256) {
+        return _queue.heapList.length;
+    }
+
+    /**
+     * @dev Inserts an element into the priority queue.
+     * @param _queue Queue to insert into.
+     * @param _priority Priority to insert.
+     * @param _value Some additional value.
+     */
+    function insert(Queue storage _queue, uint256 _priority, uint256 _value) internal {
+        uint256[] storage heapList = _queue.heapList;
+        uint256 size = heapList.length;
+        heapList.length = size + 1;
+        _percUp(heapList, size, _joinElement(_priority, _value));
+    }
+
+    /**
+     * @dev Inserts several elements into the priority queue.
+     * A batch larger than the queue is appended and heapified in one pass.
+     * @param _queue Queue to insert into.
+     * @param _priorities Priority of each element.
+     * @param _values Additional value of each element.
+     */
+    function insertBatch(Queue storage _queue, uint256[] memory _priorities, uint256[] memory _values) internal {
+        require(_priorities.length == _values.length, "Priorities and values must have the same length.");
+
+        uint256[] storage heapList = _queue.heapList;
+        uint256 size = heapList.length;
+        uint256 i;
+
+        if (_priorities.length <= size) {
+            for (i = 0; i < _priorities.length; i++) {
+                heapList.length = size + 1;
+                _percUp(heapList, size, _joinElement(_priorities[i], _values[i]));
+                size++;
+            }
+            return;
+        }
+
+        for (i = 0; i < _priorities.length; i++) {
+            heapList.push(_joinElement(_priorities[i], _values[i]));
+        }
+        size = heapList.length;
+        for (i = size / 2; i > 0; i--) {
+            _percDown(heapList, i - 1, heapList[i - 1], size);
+        }
+    }
+
+    /**
+     * @dev Returns the top element of the heap.
+     * @param _queue Queue to query.
+     * @return The smallest element in the priority queue.
+     */
+    function getMin(Queue storage _queue) internal view returns (uint256, uint256) {
+        require(_queue.heapList.length > 0, "Queue must not be empty.");
+        return _splitElement(_queue.heapList[0]);
+    }
+
+    /**
+     * @dev Deletes the top element of the heap and shifts everything up.
+     * @param _queue Queue to delete from.
+     * @return The smallest element in the priority queue.
+     */
+    function delMin(Queue storage _queue) internal returns (uint256, uint256) {
+        uint256[] storage heapList = _queue.heapList;
+        uint256 size = heapList.length;
+        require(size > 0, "Queue must not be empty.");
+
+        uint256 minElement = heapList[0];
+        uint256 lastElement = heapList[size - 1];
+
+        // Shrinking the array clears the last slot, which refunds its storage.
+        size--;
+        heapList.length = size;
+        if (size > 0) {
+            _percDown(heapList, 0, lastElement, size);
+        }
+        return _splitElement(minElement);
+    }
+
+
+    /*
+     * Private functions
+     */
+
+    /**
+     * @dev Moves an element up from a free index until its parent is smaller, then stores it.
+     * @param _heapList Heap to update.
+     * @param _index Free index to start from.
+     * @param _element Element to place.
+     */
+    function _percUp(uint256[] storage _heapList, uint256 _index, uint256 _element) private {
+        uint256 index = _index;
+        while (index > 0) {
+            uint256 parent = (index - 1) / 2;
+            uint256 parentElement = _heapList[parent];
+            if (_element >= parentElement) {
+                break;
+            }
+            _heapList[index] = parentElement;
+            index = parent;
+        }
+        _heapList[index] = _element;
+    }
+
+    /**
+     * @dev Moves an element down from a free index until its children are larger, then stores it.
+     * @param _heapList Heap to update.
+     * @param _index Free index to start from.
+     * @param _element Element to place.
+     * @param _size Number of elements in the heap.
+     */
+    function _percDown(uint256[] storage _heapList, uint256 _index, uint256 _element, uint256 _size) private {
+        uint256 index = _index;
+        while (true) {
+            uint256 child = 2 * index + 1;
+            if (child >= _size) {
+                break;
+            }
+
+            uint256 childElement = _heapList[child];
+            if (child + 1 < _size) {
+                uint256 rightElement = _heapList[child + 1];
+                if (rightElement < childElement) {
+                    child++;
+                    childElement = rightElement;
+                }
+            }
+
+            if (_element <= childElement) {
+                break;
+            }
+            _heapList[index] = childElement;
+            index = child;
+        }
+        _heapList[index] = _element;
+    }
+
+    /**
+     * @dev Joins a priority and value into a single element.
+     * @param _priority Priority of the element.
+     * @param _value Value of the element, which must fit in 128 bits.
+     * @return The packed element.
+     */
+    function _joinElement(uint256 _priority, uint256 _value) private pure returns (uint256) {
+        return _priority << 128 | _value;
+    }
+
+    /**
+     * @dev Split an element into its priority and value.
+     * @param _element Element to decode.
+     * @return A tuple containing the priority and value.
+     */
+    function _splitElement(uint256 _element) private pure returns (uint256, uint256) {
+        uint256 priority = _element >> 128;
+        uint256 value = uint256(uint128(_element));
+        return (priority, value);
+    }
+}
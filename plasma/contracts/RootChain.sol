@@ -3,7 +3,7 @@ pragma solidity ^0.4.0;
 import "./Math.sol";
 import "./Merkle.sol";
 import "./PlasmaUtils.sol";
-import "./PriorityQueue.sol";
+import "./PriorityQueueLib.sol";
 
 
 /**
@@ -11,6 +11,8 @@ import "./PriorityQueue.sol";
  * @dev Plasma Battleship root chain contract implementation.
  */
 contract RootChain {
+    using PriorityQueueLib for PriorityQueueLib.Queue;
+
     /*
      * Events
      */
@@ -40,8 +42,9 @@ contract RootChain {
     uint256 constant public CHALLENGE_PERIOD = 1 weeks;
     uint256 constant public EXIT_BOND = 123456789;
 
-    PriorityQueue exitQueue;
+    PriorityQueueLib.Queue exitQueue;
     uint256 public currentPlasmaBlockNumber;
+    uint256 public merkleDepth;
     address public operator;
 
     mapping (uint256 => PlasmaBlock) public plasmaBlocks;
@@ -79,10 +82,12 @@ contract RootChain {
      * Constructor
      */
 
-    constructor() public {
+    constructor(uint256 _merkleDepth) public {
+        require(PlasmaUtils.isValidMerkleDepth(_merkleDepth), "Merkle depth must fit in a UTXO position.");
+
         operator = msg.sender;
         currentPlasmaBlockNumber = 1;
-        exitQueue = new PriorityQueue();
+        merkleDepth = _merkleDepth;
     }
 
 
@@ -101,7 +106,7 @@ contract RootChain {
 
         // Publish the new deposit block root.
         plasmaBlocks[currentPlasmaBlockNumber] = PlasmaBlock({
-            root: PlasmaUtils.getDepositRoot(encodedDepositTx),
+            root: PlasmaUtils.getDepositRoot(encodedDepositTx, merkleDepth),
             timestamp: block.timestamp
         });
 
@@ -157,6 +162,7 @@ contract RootChain {
         // Check the transaction is included in the chain.
         PlasmaBlock memory plasmaBlock = plasmaBlocks[_utxoBlockNumber];
         bytes32 merkleHash = keccak256(abi.encodePacked(_encodedTx, _txSignatures));
+        require(_txInclusionProof.length == merkleDepth * 32, "Inclusion proof must match the Merkle depth.");
         require(Merkle.checkMembership(merkleHash, _utxoTxIndex, plasmaBlock.root, _txInclusionProof), "Transaction must be in block.");
 
         // Must wait at least one week (> 1 week old UTXOs), but might wait up to two weeks (< 1 week old UTXOs).
@@ -214,16 +220,40 @@ contract RootChain {
      * @dev Processes any exits that have completed the exit period.
      */
     function processExits() public {
+        _processExits(uint256(-1));
+    }
+
+    /**
+     * @dev Processes up to a given number of exits that have completed the exit period.
+     * @param _maxExits Maximum number of exits to process.
+     * @return Number of exits removed from the queue.
+     */
+    function processExitsBatch(uint256 _maxExits) public returns (uint256) {
+        return _processExits(_maxExits);
+    }
+
+
+    /*
+     * Private functions
+     */
+
+    /**
+     * @dev Processes exits that have completed the exit period, stopping after a given number of exits.
+     * @param _maxExits Maximum number of exits to process.
+     * @return Number of exits removed from the queue.
+     */
+    function _processExits(uint256 _maxExits) private returns (uint256) {
         uint256 exitableAt;
         uint256 utxoPosition;
+        uint256 processed = 0;
 
-        // Iterate while the queue is not empty.
-        while(exitQueue.currentSize() > 0){
+        // Iterate while the queue is not empty and the limit hasn't been reached.
+        while(exitQueue.currentSize() > 0 && processed < _maxExits){
             (exitableAt, utxoPosition) = exitQueue.getMin();
 
             // Check if this exit has finished its challenge period.
             if (exitableAt > block.timestamp){
-                return;
+                return processed;
             }
 
             PlasmaExit memory currentExit = plasmaExits[utxoPosition];
@@ -237,6 +267,9 @@ contract RootChain {
             }
 
             exitQueue.delMin();
+            processed++;
         }
+
+        return processed;
     }
 }
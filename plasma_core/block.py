@@ -1,36 +1,173 @@
 import rlp
+import weakref
 from rlp.sedes import binary, CountableList, big_endian_int
-from ethereum import utils
 from plasma_core.constants import NULL_SIGNATURE
 from plasma_core.transaction import Transaction
 from plasma_core.fixed_merkle import FixedMerkle
+from plasma_core.utils import hashing
 from plasma_core.utils.signatures import sign, get_signer
+from plasma_core.utils.transactions import MAX_MERKLE_DEPTH
+
+
+class TransactionList(list):
+    """List of the transactions in a block that tells the block whenever it changes.
+
+    The block is also registered as a listener of every transaction added
+    to the list, so changing one of the transactions tells it as well.
+    """
+
+    def __init__(self, transactions, block_ref):
+        super().__init__(transactions)
+        self._block_ref = block_ref
+        self._watch(self)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            super().__setitem__(index, value)
+            self._changed(value)
+        else:
+            super().__setitem__(index, value)
+            self._changed([value])
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._changed()
+
+    def __iadd__(self, transactions):
+        self.extend(transactions)
+        return self
+
+    def __imul__(self, count):
+        super().__imul__(count)
+        self._changed()
+        return self
+
+    def append(self, tx):
+        super().append(tx)
+        self._changed([tx])
+
+    def extend(self, transactions):
+        transactions = list(transactions)
+        super().extend(transactions)
+        self._changed(transactions)
+
+    def insert(self, index, tx):
+        super().insert(index, tx)
+        self._changed([tx])
+
+    def pop(self, index=-1):
+        tx = super().pop(index)
+        self._changed()
+        return tx
+
+    def remove(self, tx):
+        super().remove(tx)
+        self._changed()
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def reverse(self):
+        super().reverse()
+        self._changed()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._changed()
+
+    def _watch(self, transactions):
+        """Registers the block as a listener of some transactions"""
+        for tx in transactions:
+            tx.add_listener(self._block_ref)
+
+    def _changed(self, added=()):
+        """Watches any added transactions and clears the block's cached values"""
+        self._watch(added)
+        block = self._block_ref()
+        if block is not None:
+            block._clear_transactions_cache()
 
 
 class Block(rlp.Serializable):
     """Represents a Plasma block.
 
+    A block holds at most 2 ** merkle_depth transactions, one per leaf of
+    its Merkle tree. The depth is a parameter of the chain rather than
+    part of the encoding, so every block in a chain must use the depth the
+    root chain was deployed with. MERKLE_DEPTH and CAPACITY are the
+    defaults.
+
+    The Merkle tree, encoding and hash are cached. They're cleared when
+    the transactions are replaced or modified, or when any transaction in
+    the block changes, so accessing them is cheap while nothing changes.
+
     Attributes:
         transactions (Transaction[]): List of transactions in this block.
         number (int): This block's number.
         signature (bytes): Signature on this block.
+        merkle_depth (int): Depth of this block's Merkle tree.
     """
 
+    MERKLE_DEPTH = 10
+    CAPACITY = 2 ** MERKLE_DEPTH
     fields = [
         ('transactions', CountableList(Transaction)),
         ('number', big_endian_int),
         ('signature', binary),
     ]
 
-    def __init__(self, transactions=[], number=0, signature=NULL_SIGNATURE):
+    _merkle = None
+    _encoded = None
+    _hash = None
+    _ref = None
+
+    def __init__(self, transactions=[], number=0, signature=NULL_SIGNATURE, merkle_depth=MERKLE_DEPTH):
+        if not 1 <= merkle_depth <= MAX_MERKLE_DEPTH:
+            raise ValueError('merkle depth should be between 1 and {0}'.format(MAX_MERKLE_DEPTH))
+
         self.transactions = transactions
         self.number = number
         self.signature = signature
+        self.merkle_depth = merkle_depth
+
+    def __setattr__(self, attr, value):
+        if attr == 'transactions':
+            if self._ref is None:
+                self._ref = weakref.ref(self)
+            value = TransactionList(value, self._ref)
+        super().__setattr__(attr, value)
+
+        if attr == 'transactions':
+            self._clear_transactions_cache()
+        elif attr == 'number':
+            self._encoded = None
+        elif attr == 'merkle_depth':
+            self._merkle = None
+
+    @classmethod
+    def deserialize(cls, serial, merkle_depth=MERKLE_DEPTH, **kwargs):
+        """Creates a block from its serialized (but not RLP encoded) form.
+
+        Args:
+            serial (list): Nested lists of transactions, block number and signature.
+            merkle_depth (int): Depth of the chain's block Merkle trees.
+
+        Returns:
+            Block: Decoded block.
+        """
+
+        (transactions, number, signature) = serial
+        return cls([Transaction.deserialize(tx) for tx in transactions], big_endian_int.deserialize(number), signature, merkle_depth)
 
     @property
     def hash(self):
         """Hash of the RLP encoding of this block"""
-        return utils.sha3(self.encoded)
+        encoded = self.encoded
+        if self._hash is None:
+            self._hash = hashing.keccak(encoded)
+        return self._hash
 
     @property
     def signer(self):
@@ -42,15 +179,31 @@ class Block(rlp.Serializable):
         """Root of this block's Merkle tree"""
         return self.merkle.root
 
+    @property
+    def capacity(self):
+        """Maximum number of transactions in this block"""
+        return 2 ** self.merkle_depth
+
     @property
     def merkle(self):
-        """Merkle tree from the list of transactions"""
-        return FixedMerkle(10, [tx.merkle_leaf_data for tx in self.transactions])
+        """Merkle tree from the list of transactions.
+
+        The tree is built once and reused until the list of transactions
+        is replaced or modified, or any of its transactions change.
+        """
+
+        if self._merkle is None:
+            leaves = [tx.merkle_leaf_data for tx in self.transactions]
+            self._merkle = FixedMerkle(self.merkle_depth, leaves, sparse=True)
+        return self._merkle
 
     @property
     def encoded(self):
         """RLP encoded representation of this block"""
-        return rlp.encode(self, UnsignedBlock)
+        if self._encoded is None:
+            self._encoded = rlp.encode(self, UnsignedBlock)
+            self._hash = None
+        return self._encoded
 
     @property
     def is_deposit_block(self):
@@ -66,6 +219,21 @@ class Block(rlp.Serializable):
 
         self.signature = sign(self.hash, key)
 
+    def transaction_changed(self, tx):
+        """Clears the cached values after one of this block's transactions changed.
+
+        Args:
+            tx (Transaction): Transaction that changed.
+        """
+
+        self._clear_transactions_cache()
+
+    def _clear_transactions_cache(self):
+        """Clears every cached value that depends on the transactions"""
+
+        self._merkle = None
+        self._encoded = None
+
 
 class UnsignedBlock(rlp.Serializable):
 
@@ -0,0 +1,185 @@
+import rlp
+from collections.abc import Sequence
+from rlp.codec import consume_length_prefix, length_prefix
+from rlp.exceptions import DecodingError
+from rlp.sedes import big_endian_int
+from plasma_core.block import Block
+from plasma_core.fixed_merkle import FixedMerkle
+from plasma_core.transaction import Transaction
+from plasma_core.utils import hashing
+from plasma_core.utils.signatures import get_signer
+
+
+LIST_PREFIX_OFFSET = 0xc0
+
+
+def read_items(data, start, end):
+    """Finds the items of an RLP list without decoding them.
+
+    Args:
+        data (memoryview): Encoded data.
+        start (int): Position of the first byte of the list's payload.
+        end (int): Position just after the list's payload.
+
+    Returns:
+        (int, int, int)[]: Start, payload start and end positions of each item.
+    """
+
+    items = []
+    while start < end:
+        (_, length, payload_start) = consume_length_prefix(data, start)
+        items.append((start, payload_start, payload_start + length))
+        start = payload_start + length
+    if start != end:
+        raise DecodingError('RLP list payload announced wrong length', bytes(data))
+    return items
+
+
+class TransactionsView(Sequence):
+    """Sequence of the transactions in a block view, decoded on first access.
+
+    Decoded transactions are kept, so repeated lookups return the same object.
+    """
+
+    def __init__(self, block_view):
+        self._block_view = block_view
+        self._transactions = {}
+
+    def __len__(self):
+        return len(self._block_view._tx_items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if index not in self._transactions:
+            (start, _, end) = self._block_view._tx_items[index]
+            self._transactions[index] = rlp.decode(bytes(self._block_view.data[start:end]), Transaction)
+        return self._transactions[index]
+
+
+class BlockView(object):
+    """Read-only view of an RLP encoded block.
+
+    Only the positions of the block's fields and transactions are read up
+    front. Transactions are decoded one at a time when they're accessed,
+    while leaf data, the block hash and the Merkle tree are computed
+    directly from slices of the encoded block. Leaf data matches that of
+    a decoded Block as long as the block was canonically encoded, which
+    is always the case for blocks encoded with rlp.encode.
+
+    Attributes:
+        data (memoryview): Encoded block.
+        merkle_depth (int): Depth of this block's Merkle tree.
+        transactions (TransactionsView): Lazily decoded transactions in this block.
+    """
+
+    def __init__(self, data, merkle_depth=Block.MERKLE_DEPTH):
+        self.data = memoryview(data)
+        self.merkle_depth = merkle_depth
+
+        (item_type, length, start) = consume_length_prefix(self.data, 0)
+        if item_type is not list or start + length != len(self.data):
+            raise DecodingError('block should be a single RLP list', bytes(self.data))
+
+        items = read_items(self.data, start, start + length)
+        if len(items) != len(Block.fields):
+            raise DecodingError('block should have {0} fields'.format(len(Block.fields)), bytes(self.data))
+        (self._transactions_item, self._number_item, self._signature_item) = items
+
+        (_, payload_start, end) = self._transactions_item
+        self._tx_items = read_items(self.data, payload_start, end)
+        self.transactions = TransactionsView(self)
+
+        self._number = None
+        self._hash = None
+        self._merkle = None
+
+    @property
+    def number(self):
+        """This block's number"""
+        if self._number is None:
+            self._number = big_endian_int.deserialize(self._get_payload(self._number_item))
+        return self._number
+
+    @property
+    def signature(self):
+        """Signature on this block"""
+        return self._get_payload(self._signature_item)
+
+    @property
+    def encoded(self):
+        """RLP encoded representation of this block without its signature"""
+        start = self._transactions_item[0]
+        end = self._number_item[2]
+        return length_prefix(end - start, LIST_PREFIX_OFFSET) + self.data[start:end].tobytes()
+
+    @property
+    def hash(self):
+        """Hash of the RLP encoding of this block"""
+        if self._hash is None:
+            self._hash = hashing.keccak(self.encoded)
+        return self._hash
+
+    @property
+    def signer(self):
+        """Address of the signer of this block"""
+        return get_signer(self.hash, self.signature)
+
+    @property
+    def capacity(self):
+        """Maximum number of transactions in this block"""
+        return 2 ** self.merkle_depth
+
+    @property
+    def root(self):
+        """Root of this block's Merkle tree"""
+        return self.merkle.root
+
+    @property
+    def merkle(self):
+        """Merkle tree built from the raw leaf data of each transaction"""
+        if self._merkle is None:
+            leaves = [self.get_merkle_leaf_data(txindex) for txindex in range(len(self._tx_items))]
+            self._merkle = FixedMerkle(self.merkle_depth, leaves, sparse=True)
+        return self._merkle
+
+    @property
+    def is_deposit_block(self):
+        """Whether or not this is a deposit block"""
+        return len(self.transactions) == 1 and self.transactions[0].is_deposit
+
+    def get_merkle_leaf_data(self, txindex):
+        """Returns the Merkle leaf data of a transaction without decoding it.
+
+        Args:
+            txindex (int): Index of the transaction in the block.
+
+        Returns:
+            bytes: RLP encoding of the unsigned transaction concatenated with its signatures.
+        """
+
+        (_, payload_start, end) = self._tx_items[txindex]
+        (inputs_item, outputs_item, signatures_item) = read_items(self.data, payload_start, end)
+
+        unsigned_start = inputs_item[0]
+        unsigned_end = outputs_item[2]
+        encoded = length_prefix(unsigned_end - unsigned_start, LIST_PREFIX_OFFSET) + self.data[unsigned_start:unsigned_end].tobytes()
+        signatures = read_items(self.data, signatures_item[1], signatures_item[2])
+        return encoded + b''.join(self._get_payload(signature) for signature in signatures)
+
+    def to_block(self):
+        """Decodes the whole block.
+
+        Returns:
+            Block: Decoded block.
+        """
+
+        return Block.deserialize(rlp.decode(self.data.tobytes()), self.merkle_depth)
+
+    def _get_payload(self, item):
+        """Returns the payload of an RLP string item as bytes"""
+        (_, payload_start, end) = item
+        return self.data[payload_start:end].tobytes()
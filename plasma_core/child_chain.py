@@ -1,73 +1,147 @@
-from plasma_core.utils.transactions import decode_utxo_position
+from concurrent.futures import ProcessPoolExecutor
+from ethereum import utils
+from plasma_core.utils.transactions import decode_utxo_position, encode_utxo_position
+from plasma_core.utils.signatures import get_signers
 from plasma_core.utils.address import address_to_hex
+from plasma_core.block import Block
+from plasma_core.storage import MemoryStorage
+from plasma_core.orphan_pool import OrphanPool
+from plasma_core.transaction import NULL_OUTPUT
 from plasma_core.constants import NULL_SIGNATURE
 from plasma_core.exceptions import (InvalidBlockSignatureException,
+                                    InvalidBlockMerkleException,
                                     InvalidTxSignatureException,
                                     TxAlreadySpentException,
                                     TxAmountMismatchException)
 
 
+BLOCK_VALIDATION_EXCEPTIONS = (InvalidBlockSignatureException,
+                               InvalidBlockMerkleException,
+                               InvalidTxSignatureException,
+                               TxAlreadySpentException,
+                               TxAmountMismatchException)
+
+
 class ChildChain(object):
     """Stores an immutable chain of Plasma blocks.
 
     Attributes:
         operator (bytes): Address of the Plasma operator.
-        blocks (dict): Mapping from block numbers to blocks.
-        parent_queue (dict): Mapping from block numbers to pending children.
+        storage (MemoryStorage): Storage backend holding blocks, the UTXO set and the chain head.
+        orphans (OrphanPool): Blocks waiting for their parent to be added.
         current_plasma_block_number (int): The current Plasma block number.
+        validation_workers (int): Number of processes used to recover signatures, 0 to validate serially.
+        merkle_depth (int): Depth of every block's Merkle tree, which must match the root chain's. Taken from the storage if not given.
     """
 
-    def __init__(self, operator):
+    def __init__(self, operator, validation_workers=0, storage=None, max_orphans=1024, merkle_depth=None):
+        if storage is None:
+            storage = MemoryStorage(merkle_depth if merkle_depth is not None else Block.MERKLE_DEPTH)
+        elif merkle_depth is not None and storage.merkle_depth != merkle_depth:
+            raise ValueError('storage uses merkle depth {0}, not {1}'.format(storage.merkle_depth, merkle_depth))
+
         self.operator = operator
-        self.blocks = {}
-        self.parent_queue = {}
-        self.current_plasma_block_number = 1
+        self.storage = storage
+        # Blocks are decoded by the storage, so its depth is the chain's.
+        self.merkle_depth = storage.merkle_depth
+        self.orphans = OrphanPool(max_orphans)
+        self.current_plasma_block_number = self.storage.get_head()
+        self.validation_workers = validation_workers
+        self._executor = None
 
     def add_block(self, block):
         """Adds a block to the chain of blocks if it's valid.
 
+        Blocks ahead of the chain are held in the orphan pool if they're
+        signed by the operator. Once a block is added, any orphans that
+        now extend the chain are connected one after another.
+
         Attributes:
             block (Block): Block to be added.
-        """
-
-        # Is the block being added to the head?
-        if block.number == self.current_plasma_block_number:
-            # Validate the block.
-            self._validate_block(block)
 
-            # Insert the block into the chain.
-            self._apply_block(block)
+        Returns:
+            bool: True if the block was added to the chain, False otherwise.
+        """
 
-            # Update the head state.
-            self.current_plasma_block_number += 1
-        # Or does the block not yet have a parent?
-        elif block.number > self.current_plasma_block_number:
-            parent_block_number = block.number - 1
-            if parent_block_number not in self.parent_queue:
-                self.parent_queue[parent_block_number] = []
-            self.parent_queue[parent_block_number].append(block)
+        # Does the block not yet have a parent?
+        if block.number > self.current_plasma_block_number:
+            # Only hold blocks the operator signed, so others can't fill the pool.
+            self._validate_block_signature(block)
+            self.orphans.add(block)
             return False
         # Block already exists.
-        else:
+        elif block.number < self.current_plasma_block_number:
             return False
 
+        self._connect_block(block)
+
+        # Drop any competing blocks that were waiting at the same height.
+        self.orphans.pop(block.number)
+
         # Process any blocks that were waiting for this block.
-        if block.number in self.parent_queue:
-            for blk in self.parent_queue[block.number]:
-                self.add_block(blk)
-            del self.parent_queue[block.number]
+        while True:
+            blknum = self.current_plasma_block_number
+            # Deposits reported by the root chain take precedence over orphans.
+            deposit = self.storage.get_deposit(blknum)
+            candidates = ([deposit] if deposit is not None else []) + self.orphans.pop(blknum)
+            for candidate in candidates:
+                try:
+                    self._connect_block(candidate)
+                    break
+                except BLOCK_VALIDATION_EXCEPTIONS:
+                    continue
+            else:
+                break
         return True
 
-    def validate_transaction(self, tx, temp_spent={}):
+    def add_deposit(self, block):
+        """Adds a deposit block created on the root chain.
+
+        Deposits only come from root chain events, so a deposit ahead of
+        the chain is kept in storage instead of the orphan pool, where it
+        could be dropped. It's connected once the chain reaches it.
+
+        Args:
+            block (Block): Deposit block to be added.
+
+        Returns:
+            bool: True if the block was added to the chain, False otherwise.
+        """
+
+        if block.number > self.current_plasma_block_number:
+            self.storage.add_deposit(block)
+            return False
+        return self.add_block(block)
+
+    def add_root(self, blknum, root):
+        """Records the root committed to the root chain for a block.
+
+        Blocks added afterwards must match the committed root.
+
+        Args:
+            blknum (int): Number of the block.
+            root (bytes): Committed root.
+        """
+
+        self.storage.add_root(blknum, root)
+
+        # A block that's already in the chain must match its commitment.
+        if blknum < self.current_plasma_block_number and self.get_block(blknum).root != root:
+            raise InvalidBlockMerkleException('block {0} does not match its committed root'.format(blknum))
+
+    def validate_transaction(self, tx, temp_spent=None):
         """Determines whether a transaction is valid.
 
         Attributes:
             tx (Transaction): Transaction to be validated.
-            temp_spent (dict): Optional additional set of spent transactions.
+            temp_spent (dict): Optional additional set of spent input positions.
         """
 
+        temp_spent = temp_spent if temp_spent is not None else {}
         input_amount = 0
         output_amount = sum([o.amount for o in tx.outputs])
+        signers = tx.signers
+        tx_spent = set()
 
         for i in range(len(tx.inputs)):
             tx_input = tx.inputs[i]
@@ -76,18 +150,28 @@ class ChildChain(object):
             if tx_input.blknum == 0:
                 continue
 
-            input_tx = self.get_transaction(tx_input.position)
-            input_amount += input_tx.outputs[tx_input.oindex].amount
+            # Check to see if the input is already spent.
+            position = tx_input.position
+            input_utxo = self.get_utxo(position)
+            if input_utxo is None or position in temp_spent or position in tx_spent:
+                raise TxAlreadySpentException('input {0} is spent or does not exist'.format(position))
+            tx_spent.add(position)
 
-            if tx.signatures[i] == NULL_SIGNATURE or tx.signers[i] != input_tx.outputs[tx_input.oindex].owner:
-                raise InvalidTxSignatureException('failed to validate tx')
+            input_amount += input_utxo.amount
 
-            # Check to see if the input is already spent.
-            if input_tx.spent[tx_input.oindex] or tx_input.position in temp_spent:
-                raise TxAlreadySpentException('failed to validate tx')
+            if tx.signatures[i] == NULL_SIGNATURE or signers[i] != input_utxo.owner:
+                raise InvalidTxSignatureException('input {0} is not signed by its owner'.format(position))
 
         if not tx.is_deposit and input_amount < output_amount:
-            raise TxAmountMismatchException('failed to validate tx')
+            raise TxAmountMismatchException('outputs total {0} but inputs total {1}'.format(output_amount, input_amount))
+
+    def close(self):
+        """Shuts down the signature recovery processes, if any were started, and closes the storage"""
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self.storage.close()
 
     def get_block(self, blknum):
         """Returns the block for a given block number.
@@ -99,10 +183,10 @@ class ChildChain(object):
             Block: Corresponding block object.
         """
 
-        return self.blocks[blknum]
+        return self.storage.get_block(blknum)
 
     def get_transaction(self, transaction_position):
-        """Returns the transaction at a given position.
+        """Returns the transaction at a given position, along with any stored confirmations.
 
         Args:
             transaction_position (int): Transaction position to query.
@@ -112,42 +196,216 @@ class ChildChain(object):
         """
 
         (blknum, txindex, _) = decode_utxo_position(transaction_position)
-        return self.blocks[blknum].transactions[txindex]
+        tx = self.get_block(blknum).transactions[txindex]
+
+        # Confirmations aren't part of the block encoding, so they're kept separately.
+        confirmations = self.storage.get_confirmations(encode_utxo_position(blknum, txindex, 0))
+        if confirmations:
+            tx.confirmations = [confirmations.get(index, confirmation) for (index, confirmation) in enumerate(tx.confirmations)]
+        return tx
+
+    def add_confirmation(self, transaction_position, index, confirmation):
+        """Stores a confirmation signature for one of a transaction's inputs.
+
+        Args:
+            transaction_position (int): Position of the confirmed transaction.
+            index (int): Index of the confirmed input.
+            confirmation (bytes): Confirmation signature.
+        """
+
+        (blknum, txindex, _) = decode_utxo_position(transaction_position)
+        self.storage.add_confirmation(encode_utxo_position(blknum, txindex, 0), index, confirmation)
+
+    def get_utxo(self, utxo_position):
+        """Returns the unspent output at a given position.
+
+        Args:
+            utxo_position (int): Output position to query.
 
-    def _apply_transaction(self, tx):
-        """Marks the inputs to a transaction as spent.
+        Returns:
+            TransactionOutput: Corresponding output, or None if it doesn't exist or was spent.
+        """
+
+        return self.storage.get_utxo(utxo_position)
+
+    def get_spending_position(self, utxo_position):
+        """Returns the position of the input that spent an output.
+
+        The position encodes the spending transaction's block number and
+        index, followed by the index of the input that spends the output.
 
         Args:
-            tx (Transaction): Transaction to modify.
+            utxo_position (int): Output position to query.
+
+        Returns:
+            int: Position of the spending input, or None if the output wasn't spent.
         """
 
-        for i in tx.inputs:
+        return self.storage.get_spend(utxo_position)
+
+    def get_challenge_data(self, utxo_position):
+        """Returns the information needed to challenge an exit from a spent output.
+
+        Args:
+            utxo_position (int): Position of the output being exited.
+
+        Returns:
+            bytes, bytes: Encoded spending transaction and the confirmation signature for the spent input, or None if the output wasn't spent or the spend's confirmation isn't known.
+        """
+
+        spending_position = self.get_spending_position(utxo_position)
+        if spending_position is None:
+            return None
+
+        spend_tx = self.get_transaction(spending_position)
+        (_, _, input_index) = decode_utxo_position(spending_position)
+        confirmation = spend_tx.confirmations[input_index]
+        if confirmation == NULL_SIGNATURE:
+            return None
+        return (spend_tx.encoded, confirmation)
+
+    def get_utxo_positions(self, owner):
+        """Returns the positions of all unspent outputs owned by an address.
+
+        Args:
+            owner (bytes): Address of the owner.
+
+        Returns:
+            int[]: Sorted list of output positions.
+        """
+
+        return sorted(self.storage.get_utxo_positions(utils.normalize_address(owner)))
+
+    def get_balance(self, owner):
+        """Returns the total amount held in unspent outputs by an address.
+
+        Args:
+            owner (bytes): Address of the owner.
+
+        Returns:
+            int: Sum of the owner's unspent outputs.
+        """
+
+        positions = self.storage.get_utxo_positions(utils.normalize_address(owner))
+        return sum(self.get_utxo(position).amount for position in positions)
+
+    def _apply_transaction(self, tx, blknum, txindex, spends, created_utxos):
+        """Collects the outputs a transaction spends and the outputs it creates.
+
+        Args:
+            tx (Transaction): Transaction to apply.
+            blknum (int): Number of the block that includes the transaction.
+            txindex (int): Index of the transaction in the block.
+            spends (dict): Mapping to add spent output positions and the positions of their spending inputs to.
+            created_utxos (dict): Mapping to add created outputs to.
+        """
+
+        for input_index, i in enumerate(tx.inputs):
             if i.blknum == 0:
                 continue
-            input_tx = self.get_transaction(i.position)
-            input_tx.spent[i.oindex] = True
+            spends[i.position] = encode_utxo_position(blknum, txindex, input_index)
+
+        for oindex, output in enumerate(tx.outputs):
+            # Only the padding output can never be spent, zero value outputs still can.
+            if output != NULL_OUTPUT:
+                created_utxos[encode_utxo_position(blknum, txindex, oindex)] = output
+
+    def _connect_block(self, block):
+        """Validates a block at the head of the chain and inserts it.
+
+        Args:
+            block (Block): Block to connect.
+        """
+
+        # Validate the block.
+        self._validate_block(block)
+
+        # Insert the block into the chain.
+        self._apply_block(block)
+
+        # Update the head state.
+        self.current_plasma_block_number += 1
+
+    def _validate_block_signature(self, block):
+        """Checks that a block other than a deposit block is signed by the operator.
+
+        Args:
+            block (Block): Block to check.
+        """
+
+        if not block.is_deposit_block and (block.signature == NULL_SIGNATURE or address_to_hex(block.signer) != self.operator):
+            raise InvalidBlockSignatureException('failed to validate block')
 
     def _validate_block(self, block):
         """Determines if a block is valid.
 
+        Transactions are checked in a single pass. An input spent by an
+        earlier transaction in the same block counts as already spent.
+
         Args:
             block (Block): Block to validate.
         """
 
-        # Check for a valid signature.
-        if not block.is_deposit_block and (block.signature == NULL_SIGNATURE or address_to_hex(block.signer) != self.operator):
-            raise InvalidBlockSignatureException('failed to validate block')
+        self._validate_block_signature(block)
 
-        for tx in block.transactions:
-            self.validate_transaction(tx)
+        # Check that the block's transactions fit in a tree of the chain's depth.
+        if block.merkle_depth != self.merkle_depth:
+            raise InvalidBlockMerkleException('block {0} has merkle depth {1}, expected {2}'.format(block.number, block.merkle_depth, self.merkle_depth))
+        if len(block.transactions) > block.capacity:
+            raise InvalidBlockMerkleException('block {0} has more than {1} transactions'.format(block.number, block.capacity))
+
+        # Check the block against its committed root, if one is known.
+        committed_root = self.storage.get_root(block.number)
+        if committed_root is not None and block.root != committed_root:
+            raise InvalidBlockMerkleException('block {0} does not match its committed root'.format(block.number))
+
+        if self.validation_workers > 0 and len(block.transactions) > 1:
+            self._recover_signers(block)
+
+        # Inputs consumed by earlier transactions in this block, mapped to the spending transaction's index.
+        block_spent = {}
+        for txindex, tx in enumerate(block.transactions):
+            try:
+                self.validate_transaction(tx, temp_spent=block_spent)
+            except (TxAlreadySpentException, InvalidTxSignatureException, TxAmountMismatchException) as e:
+                raise type(e)('failed to validate tx {0} in block {1}: {2}'.format(txindex, block.number, e)) from e
+
+            for tx_input in tx.inputs:
+                if tx_input.blknum != 0:
+                    block_spent[tx_input.position] = txindex
+
+    def _recover_signers(self, block):
+        """Recovers the signers of every transaction in a block across a process pool.
+
+        The recovered addresses are cached on each transaction so that the
+        serial validation pass doesn't need to recover them again.
+
+        Args:
+            block (Block): Block with transactions to recover.
+        """
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.validation_workers)
+
+        hashes = [tx.hash for tx in block.transactions]
+        signatures = [tx.signatures for tx in block.transactions]
+        chunksize = max(1, len(hashes) // (self.validation_workers * 4))
+
+        recovered = self._executor.map(get_signers, hashes, signatures, chunksize=chunksize)
+        for tx, signers in zip(block.transactions, recovered):
+            tx.cache_signers(signers)
 
     def _apply_block(self, block):
         """Marks all of the transactions in a block as spent and inserts it.
 
+        The block and its changes to the UTXO set are written to storage in one batch.
+
         Args:
             block (Block): Block to insert.
         """
 
-        for tx in block.transactions:
-            self._apply_transaction(tx)
-        self.blocks[block.number] = block
+        spends = {}
+        created_utxos = {}
+        for txindex, tx in enumerate(block.transactions):
+            self._apply_transaction(tx, block.number, txindex, spends, created_utxos)
+        self.storage.commit_block(block, spends, created_utxos, block.number + 1)
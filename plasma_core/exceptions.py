@@ -20,3 +20,11 @@ class TxAmountMismatchException(Exception):
 
 class InvalidBlockMerkleException(Exception):
     """merkle tree of a block is invalid"""
+
+
+class DuplicateTxException(Exception):
+    """the transaction is already pending"""
+
+
+class DepositTxException(Exception):
+    """deposit transactions can only be created by the root chain"""
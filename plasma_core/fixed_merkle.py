@@ -1,47 +1,79 @@
-from ethereum.utils import sha3
 from plasma_core.constants import NULL_HASH
+from plasma_core.utils import hashing
 from .exceptions import NonexistentMemberException
 
 
-class Node(object):
-    """Represents a node in a Merkle tree.
+HASH_SIZE = 32
 
-    Attributes:
-        data (bytes): Data stored at this node.
-        left (Node): Left child of this node.
-        right (Node): Right child of this node.
+_empty_hashes = {}
+
+
+def get_empty_hashes(depth):
+    """Returns the root of an empty subtree for every level up to a depth.
+
+    Args:
+        depth (int): Depth of the tallest subtree.
+
+    Returns:
+        bytes[]: Empty subtree roots, indexed by subtree height.
     """
 
-    def __init__(self, data, left=None, right=None):
-        self.data = data
-        self.left = left
-        self.right = right
+    if depth not in _empty_hashes:
+        empty_hashes = [hashing.keccak(NULL_HASH)]
+        for _ in range(depth):
+            empty_hashes.append(hashing.keccak(empty_hashes[-1] + empty_hashes[-1]))
+        _empty_hashes[depth] = empty_hashes
+    return _empty_hashes[depth]
 
 
 class FixedMerkle(object):
     """Represents a fixed depth Merkle tree.
 
+    Each level of the tree is stored as a single byte string of
+    concatenated 32 byte hashes, starting with the leaves. A sparse tree
+    only stores the nodes that have a non-empty leaf below them and uses
+    precomputed empty subtree hashes for everything else.
+
     Attributes:
         depth (int): Depth of the tree.
-        leaves (bytes[]): List of hashed leaves in this tree.
-        tree (Node[]): How much value is being exited.
+        sparse (bool): Whether empty subtrees are left out of the tree.
+        tree (bytes[]): Concatenated node hashes for each level of the tree.
+        root (bytes): Root hash of the tree.
     """
 
-    def __init__(self, depth, leaves=[]):
+    def __init__(self, depth, leaves=[], sparse=False):
         if depth < 1:
             raise ValueError('depth should be at least 1')
 
         self.depth = depth
+        self.sparse = sparse
 
         leaf_count = 2 ** depth
         if len(leaves) > leaf_count:
             raise ValueError('too many leaves for the specified depth')
 
-        hashed_leaves = [sha3(leaf) for leaf in leaves]
-        self.leaves = hashed_leaves + [sha3(NULL_HASH)] * (leaf_count - len(hashed_leaves))
-        self.tree = [[Node(leaf) for leaf in self.leaves]]
+        self._empty_hashes = get_empty_hashes(depth)
+
+        hashed_leaves = hashing.keccak_batch(leaves)
+        if not sparse:
+            hashed_leaves += [self._empty_hashes[0]] * (leaf_count - len(hashed_leaves))
+
+        self._leaf_indices = {}
+        for index, leaf in enumerate(hashed_leaves):
+            self._leaf_indices.setdefault(leaf, index)
+        if len(hashed_leaves) < leaf_count:
+            self._leaf_indices.setdefault(self._empty_hashes[0], len(hashed_leaves))
+
+        self.tree = [b''.join(hashed_leaves)]
         self._create_tree(self.tree[0])
 
+    @property
+    def leaves(self):
+        """List of hashed leaves in this tree"""
+        level = self.tree[0]
+        leaves = [level[i:i + HASH_SIZE] for i in range(0, len(level), HASH_SIZE)]
+        return leaves + [self._empty_hashes[0]] * (2 ** self.depth - len(leaves))
+
     def check_membership(self, leaf, index, proof):
         """Checks the validity of a Merkle proof.
 
@@ -54,14 +86,14 @@ class FixedMerkle(object):
             bool: True if the leaf is in the tree, False otherwise.
         """
 
-        leaf = sha3(leaf)
+        leaf = hashing.keccak(leaf)
         computed_hash = leaf
-        for i in range(0, self.depth * 32, 32):
-            segment = proof[i:i + 32]
+        for i in range(0, self.depth * HASH_SIZE, HASH_SIZE):
+            segment = proof[i:i + HASH_SIZE]
             if index % 2 == 0:
-                computed_hash = sha3(computed_hash + segment)
+                computed_hash = hashing.keccak(computed_hash + segment)
             else:
-                computed_hash = sha3(segment + computed_hash)
+                computed_hash = hashing.keccak(segment + computed_hash)
             index = index // 2
         return computed_hash == self.root
 
@@ -75,47 +107,150 @@ class FixedMerkle(object):
             bytes: A Merkle proof for the leaf.
         """
 
-        leaf = sha3(leaf)
+        leaf = hashing.keccak(leaf)
         if not self._is_member(leaf):
             raise NonexistentMemberException('leaf is not in the merkle tree')
 
-        index = self.leaves.index(leaf)
-        proof = b''
+        return self._create_proof(self._leaf_indices[leaf])
+
+    def create_membership_proofs(self):
+        """Creates a membership proof for every stored leaf.
+
+        Returns:
+            bytes[]: Merkle proofs, indexed by leaf index.
+        """
+
+        return [self._create_proof(index) for index in range(len(self.tree[0]) // HASH_SIZE)]
+
+    def create_multiproof(self, indices):
+        """Creates a single proof for several leaves.
+
+        The proof holds each sibling hash needed to rebuild the root
+        exactly once. Siblings that can be computed from the other leaves
+        in the set are left out. Hashes are ordered by level, starting at
+        the leaves, and by index within each level.
+
+        Args:
+            indices (int[]): Indices of the leaves to prove.
+
+        Returns:
+            bytes: A Merkle multiproof for the leaves.
+        """
+
+        if not indices:
+            raise ValueError('at least one leaf index is required')
+        if min(indices) < 0 or max(indices) >= 2 ** self.depth:
+            raise NonexistentMemberException('leaf is not in the merkle tree')
+
+        known = set(indices)
+        proof = []
+        for height in range(self.depth):
+            for index in sorted(known):
+                if index ^ 1 not in known:
+                    proof.append(self._get_node(height, index ^ 1))
+            known = {index // 2 for index in known}
+        return b''.join(proof)
+
+    def check_multiproof(self, leaves, indices, proof):
+        """Checks the validity of a Merkle multiproof.
+
+        Args:
+            leaves (bytes[]): Data at each of the given leaves.
+            indices (int[]): Index of each leaf in the tree.
+            proof (bytes): A multiproof for those leaves.
+
+        Returns:
+            bool: True if all of the leaves are in the tree, False otherwise.
+        """
+
+        if not leaves or len(leaves) != len(indices):
+            return False
+
+        nodes = {}
+        for leaf, index in zip(leaves, indices):
+            leaf = hashing.keccak(leaf)
+            if not 0 <= index < 2 ** self.depth or nodes.setdefault(index, leaf) != leaf:
+                return False
+
+        offset = 0
+        for _ in range(self.depth):
+            parents = {}
+            for index in sorted(nodes):
+                # Each pair of siblings is hashed once, when its left node is reached.
+                if index % 2 == 1 and index ^ 1 in nodes:
+                    continue
+
+                if index ^ 1 in nodes:
+                    sibling = nodes[index ^ 1]
+                else:
+                    sibling = proof[offset:offset + HASH_SIZE]
+                    if len(sibling) != HASH_SIZE:
+                        return False
+                    offset += HASH_SIZE
+
+                if index % 2 == 0:
+                    parents[index // 2] = hashing.keccak(nodes[index] + sibling)
+                else:
+                    parents[index // 2] = hashing.keccak(sibling + nodes[index])
+            nodes = parents
+
+        return offset == len(proof) and nodes[0] == self.root
+
+    def _get_node(self, height, index):
+        """Returns the hash of a node, including nodes of empty subtrees left out of a sparse tree.
+
+        Args:
+            height (int): Height of the node above the leaves.
+            index (int): Index of the node in its level.
+
+        Returns:
+            bytes: Hash of the node.
+        """
+
+        offset = index * HASH_SIZE
+        return self.tree[height][offset:offset + HASH_SIZE] or self._empty_hashes[height]
+
+    def _create_proof(self, index):
+        """Creates a membership proof for the leaf at an index.
+
+        Args:
+            index (int): Index of the leaf in the tree.
+
+        Returns:
+            bytes: A Merkle proof for the leaf.
+        """
+
+        proof = []
         for i in range(0, self.depth, 1):
-            sibling_index = index + (1 if index % 2 == 0 else -1)
+            proof.append(self._get_node(i, index ^ 1))
             index = index // 2
-            proof += self.tree[i][sibling_index].data
-        return proof
+        return b''.join(proof)
 
-    def _create_tree(self, nodes):
-        """Recursively creates the tree given a set of nodes.
+    def _create_tree(self, level):
+        """Creates the remaining levels of the tree given its leaf level.
 
         Args:
-            nodes (Node[]): A set of nodes for a specific depth.
+            level (bytes): Concatenated node hashes for the bottom level.
         """
 
-        if len(nodes) == 1:
-            self.root = nodes[0].data
-            return self.root
-
-        next_level = len(nodes)
-        tree_level = []
-        for i in range(0, next_level, 2):
-            combined = sha3(nodes[i].data + nodes[i + 1].data)
-            next_node = Node(combined, nodes[i], nodes[i + 1])
-            tree_level.append(next_node)
+        for height in range(self.depth):
+            # A level with an odd number of nodes is missing an empty right sibling.
+            if len(level) % (2 * HASH_SIZE) != 0:
+                level += self._empty_hashes[height]
 
-        self.tree.append(tree_level)
-        self._create_tree(tree_level)
+            # Adjacent siblings are already concatenated, so each parent is the hash of a 64 byte slice.
+            level = hashing.keccak_chunks(level, 2 * HASH_SIZE)
+            self.tree.append(level)
+        self.root = level or self._empty_hashes[self.depth]
 
     def _is_member(self, leaf):
         """Checks if a leaf is in the set of stored leaves.
 
         Args:
-            leaves (bytes): A set of nodes for a specific depth.
+            leaf (bytes): Hashed leaf to look for.
 
         Returns:
             bool: True if the leaf is in the set, False otherwise
         """
 
-        return leaf in self.leaves
+        return leaf in self._leaf_indices
@@ -0,0 +1,80 @@
+from collections import OrderedDict
+from itertools import islice
+from plasma_core.block import Block
+from plasma_core.exceptions import DuplicateTxException, DepositTxException
+
+
+class Mempool(object):
+    """Holds validated transactions until the operator puts them in a block.
+
+    Attributes:
+        child_chain (ChildChain): Chain that pending transactions are validated against.
+        capacity (int): Maximum number of transactions in a built block, defaults to the chain's block capacity.
+        transactions (OrderedDict): Mapping from hashes to pending transactions, in arrival order.
+        spent (dict): Mapping from input positions to the hash of the pending transaction spending them.
+    """
+
+    def __init__(self, child_chain, capacity=None):
+        self.child_chain = child_chain
+        self.capacity = capacity if capacity is not None else 2 ** child_chain.merkle_depth
+        self.transactions = OrderedDict()
+        self.spent = {}
+
+    def __len__(self):
+        return len(self.transactions)
+
+    def add_transaction(self, tx):
+        """Validates a transaction and adds it to the pool.
+
+        Transactions that spend an input already spent by a pending
+        transaction are rejected like any other double spend.
+
+        Args:
+            tx (Transaction): Transaction to add.
+        """
+
+        if tx.is_deposit:
+            raise DepositTxException('failed to add tx')
+
+        if tx.hash in self.transactions:
+            raise DuplicateTxException('failed to add tx')
+
+        self.child_chain.validate_transaction(tx, temp_spent=self.spent)
+
+        self.transactions[tx.hash] = tx
+        for tx_input in tx.inputs:
+            if tx_input.blknum != 0:
+                self.spent[tx_input.position] = tx.hash
+
+    def build_block(self, blknum=None):
+        """Creates a block from the oldest pending transactions.
+
+        Transactions stay in the pool until the block is applied and
+        removed with remove_block.
+
+        Args:
+            blknum (int): Number of the block, defaults to the child chain's next block.
+
+        Returns:
+            Block: Unsigned block with up to capacity transactions.
+        """
+
+        if blknum is None:
+            blknum = self.child_chain.current_plasma_block_number
+
+        transactions = list(islice(self.transactions.values(), self.capacity))
+        return Block(transactions=transactions, number=blknum, merkle_depth=self.child_chain.merkle_depth)
+
+    def remove_block(self, block):
+        """Removes the transactions included in a block from the pool.
+
+        Args:
+            block (Block): Block that was added to the chain.
+        """
+
+        for tx in block.transactions:
+            if self.transactions.pop(tx.hash, None) is None:
+                continue
+            for tx_input in tx.inputs:
+                if self.spent.get(tx_input.position) == tx.hash:
+                    del self.spent[tx_input.position]
@@ -0,0 +1,91 @@
+import heapq
+from collections import OrderedDict
+
+
+class OrphanPool(object):
+    """Holds blocks that arrived before their parent, up to a fixed number.
+
+    When the pool is full, the block furthest ahead of the chain is
+    evicted, since it's the last one that could be connected.
+
+    Attributes:
+        max_size (int): Maximum number of blocks held by the pool.
+    """
+
+    def __init__(self, max_size):
+        if max_size < 1:
+            raise ValueError('max_size should be at least 1')
+
+        self.max_size = max_size
+        self._blocks = {}
+        self._numbers = []
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, block):
+        """Adds a block to the pool.
+
+        Args:
+            block (Block): Block waiting for its parent.
+
+        Returns:
+            bool: True if the block was added, False if it was a duplicate or was evicted right away.
+        """
+
+        # The block hash doesn't cover the signature, so a badly signed copy mustn't shadow the real block.
+        key = (block.hash, block.signature)
+        candidates = self._blocks.get(block.number, OrderedDict())
+        if key in candidates:
+            return False
+
+        if self._size >= self.max_size:
+            if block.number >= self._highest_number():
+                return False
+            self._evict()
+
+        if block.number not in self._blocks:
+            self._blocks[block.number] = candidates
+            heapq.heappush(self._numbers, -block.number)
+        candidates[key] = block
+        self._size += 1
+        return True
+
+    def pop(self, blknum):
+        """Removes and returns every block with a given number.
+
+        Args:
+            blknum (int): Block number to query.
+
+        Returns:
+            Block[]: Blocks with that number, in arrival order.
+        """
+
+        candidates = self._blocks.pop(blknum, OrderedDict())
+        self._size -= len(candidates)
+
+        # Popped numbers stay in the heap until they reach the top, so rebuild it if they pile up.
+        if len(self._numbers) > 2 * len(self._blocks):
+            self._numbers = [-number for number in self._blocks]
+            heapq.heapify(self._numbers)
+
+        return list(candidates.values())
+
+    def _highest_number(self):
+        """Returns the highest block number in the pool, dropping stale heap entries"""
+
+        while -self._numbers[0] not in self._blocks:
+            heapq.heappop(self._numbers)
+        return -self._numbers[0]
+
+    def _evict(self):
+        """Removes the most recently added block with the highest number"""
+
+        blknum = self._highest_number()
+        candidates = self._blocks[blknum]
+        candidates.popitem()
+        self._size -= 1
+        if not candidates:
+            del self._blocks[blknum]
+            heapq.heappop(self._numbers)
@@ -0,0 +1,110 @@
+from collections import OrderedDict
+from plasma_core.utils.transactions import decode_utxo_position
+
+
+class ProofCache(object):
+    """Serves Merkle membership proofs for transactions in a child chain.
+
+    Proofs are kept per block in a least recently used cache bounded by
+    the total size of the stored proofs. Blocks can be precomputed when
+    they're committed; any other block is built on its first request.
+
+    Attributes:
+        child_chain (ChildChain): Chain to read blocks from.
+        max_bytes (int): Maximum total size of cached proofs.
+        size (int): Current total size of cached proofs.
+    """
+
+    def __init__(self, child_chain, max_bytes=64 * 1024 * 1024):
+        self.child_chain = child_chain
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._blocks = OrderedDict()
+
+    def __len__(self):
+        return len(self._blocks)
+
+    def __contains__(self, blknum):
+        return blknum in self._blocks
+
+    def precompute(self, block):
+        """Creates and caches the proofs for every transaction in a block.
+
+        Args:
+            block (Block): Block to create proofs for.
+
+        Returns:
+            bytes[]: Merkle proofs, indexed by transaction index.
+        """
+
+        proofs = block.merkle.create_membership_proofs()
+        self._insert(block.number, proofs)
+        return proofs
+
+    def get_proof(self, blknum, txindex):
+        """Returns the membership proof for a transaction.
+
+        Args:
+            blknum (int): Number of the block that includes the transaction.
+            txindex (int): Index of the transaction in the block.
+
+        Returns:
+            bytes: A Merkle proof for the transaction.
+        """
+
+        proofs = self._blocks.get(blknum)
+        if proofs is None:
+            proofs = self.precompute(self.child_chain.get_block(blknum))
+        else:
+            self._blocks.move_to_end(blknum)
+        return proofs[txindex]
+
+    def get_proof_for_position(self, transaction_position):
+        """Returns the membership proof for the transaction at a given position.
+
+        Args:
+            transaction_position (int): Transaction position to query.
+
+        Returns:
+            bytes: A Merkle proof for the transaction.
+        """
+
+        (blknum, txindex, _) = decode_utxo_position(transaction_position)
+        return self.get_proof(blknum, txindex)
+
+    def discard(self, blknum):
+        """Removes the proofs for a block from the cache, if present.
+
+        Args:
+            blknum (int): Block number to remove.
+        """
+
+        proofs = self._blocks.pop(blknum, None)
+        if proofs is not None:
+            self.size -= self._get_size(proofs)
+
+    def _insert(self, blknum, proofs):
+        """Caches the proofs for a block, evicting the least recently used blocks to make room.
+
+        Args:
+            blknum (int): Number of the block.
+            proofs (bytes[]): Merkle proofs, indexed by transaction index.
+        """
+
+        self.discard(blknum)
+
+        size = self._get_size(proofs)
+        # Proofs that could never fit are served without being cached.
+        if size > self.max_bytes:
+            return
+
+        while self.size + size > self.max_bytes:
+            (_, evicted) = self._blocks.popitem(last=False)
+            self.size -= self._get_size(evicted)
+
+        self._blocks[blknum] = proofs
+        self.size += size
+
+    def _get_size(self, proofs):
+        """Returns the total size of a list of proofs"""
+        return sum(len(proof) for proof in proofs)
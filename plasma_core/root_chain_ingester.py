@@ -0,0 +1,186 @@
+import asyncio
+import functools
+from eth_utils import encode_hex, event_abi_to_log_topic
+from web3.utils.events import get_event_data
+from plasma_core.block import Block
+from plasma_core.transaction import Transaction, TransactionOutput
+
+
+class RootChainIngester(object):
+    """Follows events emitted by the root chain and feeds them into a child chain.
+
+    Logs for a whole range of root chain blocks are fetched with a single
+    eth_getLogs request. Fetched batches wait in a bounded queue until
+    they're applied, so fetching pauses whenever the child chain falls
+    behind. After each batch is applied, the next root chain block to
+    fetch is checkpointed in the child chain's storage. Deposits ahead of
+    the child chain are kept in the same storage until the chain reaches
+    them, so nothing before the checkpoint is lost. Applying a batch
+    twice has no effect, so a restart can safely repeat the last batch.
+
+    Attributes:
+        w3 (Web3): Web3 instance connected to the root chain, such as Deployer.w3.
+        root_chain (Contract): Root chain contract instance.
+        child_chain (ChildChain): Chain to feed deposits and committed roots into.
+        start_block (int): Root chain block to start from if there's no checkpoint.
+        batch_size (int): Maximum number of root chain blocks per log request.
+        confirmations (int): Number of blocks to wait for before reading a block's logs.
+        poll_interval (float): Seconds to wait for new root chain blocks once caught up.
+        queue_size (int): Maximum number of fetched batches waiting to be applied.
+        exits (dict): Mapping from UTXO positions to the outputs being exited.
+        challenges (dict): Mapping from positions of exiting UTXOs that were already spent, with a known confirmation, to their challenge data.
+    """
+
+    CHECKPOINT_KEY = 'root_chain_block'
+    EVENTS = ('DepositCreated', 'PlasmaBlockRootCommitted', 'ExitStarted')
+
+    def __init__(self, w3, root_chain, child_chain, start_block=0, batch_size=1000, confirmations=0, poll_interval=1.0, queue_size=4):
+        self.w3 = w3
+        self.root_chain = root_chain
+        self.child_chain = child_chain
+        self.start_block = start_block
+        self.batch_size = batch_size
+        self.confirmations = confirmations
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self.exits = {}
+        self.challenges = {}
+
+        self._event_abis = {
+            event_abi_to_log_topic(abi): abi for abi in root_chain.abi
+            if abi['type'] == 'event' and abi['name'] in self.EVENTS
+        }
+        self._handlers = {
+            'DepositCreated': self._handle_deposit,
+            'PlasmaBlockRootCommitted': self._handle_root,
+            'ExitStarted': self._handle_exit,
+        }
+
+    @property
+    def next_block(self):
+        """Next root chain block to fetch logs from"""
+        return self.child_chain.storage.get_meta(self.CHECKPOINT_KEY, self.start_block)
+
+    def run_until_synced(self):
+        """Applies every event up to the current root chain block, then returns"""
+        asyncio.get_event_loop().run_until_complete(self.sync())
+
+    async def sync(self):
+        """Applies every event up to the current root chain block, then returns"""
+        await self._ingest(follow=False)
+
+    async def run(self):
+        """Applies events until cancelled, polling for new root chain blocks once caught up"""
+        await self._ingest(follow=True)
+
+    def handle_event(self, event):
+        """Applies a single decoded root chain event to the child chain.
+
+        Args:
+            event (AttributeDict): Event with its name and arguments, as decoded by web3.
+        """
+
+        handler = self._handlers.get(event['event'])
+        if handler is not None:
+            handler(event['args'])
+
+    async def _ingest(self, follow):
+        """Runs the log fetcher and applies batches until the fetcher is done.
+
+        Args:
+            follow (bool): Whether to keep polling for new blocks once caught up.
+        """
+
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        fetcher = asyncio.ensure_future(self._fetch_logs(queue, follow))
+        try:
+            await self._apply_logs(queue, fetcher)
+        except BaseException:
+            fetcher.cancel()
+            raise
+
+        # Surfaces any error raised while fetching.
+        await fetcher
+
+    async def _fetch_logs(self, queue, follow):
+        """Fetches logs in batches of blocks and puts them in a queue.
+
+        Args:
+            queue (asyncio.Queue): Queue of (last block, logs) batches.
+            follow (bool): Whether to keep polling for new blocks once caught up.
+        """
+
+        from_block = self.next_block
+        while True:
+            head = await self._call(getattr, self.w3.eth, 'blockNumber') - self.confirmations
+            while from_block <= head:
+                to_block = min(from_block + self.batch_size - 1, head)
+                logs = await self._call(self._get_logs, from_block, to_block)
+                # Blocks while the queue is full.
+                await queue.put((to_block, logs))
+                from_block = to_block + 1
+
+            if not follow:
+                return
+            await asyncio.sleep(self.poll_interval)
+
+    async def _apply_logs(self, queue, fetcher):
+        """Applies batches of logs from a queue until the fetcher is done and the queue is empty.
+
+        Args:
+            queue (asyncio.Queue): Queue of (last block, logs) batches.
+            fetcher (asyncio.Future): Task fetching the logs.
+        """
+
+        while not (fetcher.done() and queue.empty()):
+            getter = asyncio.ensure_future(queue.get())
+            await asyncio.wait([getter, fetcher], return_when=asyncio.FIRST_COMPLETED)
+            if not getter.done():
+                getter.cancel()
+                continue
+
+            (to_block, logs) = getter.result()
+            for log in logs:
+                self.handle_event(get_event_data(self._event_abis[bytes(log['topics'][0])], log))
+            self.child_chain.storage.set_meta(self.CHECKPOINT_KEY, to_block + 1)
+
+    def _get_logs(self, from_block, to_block):
+        """Returns the root chain's logs for a range of blocks, in the order they were emitted.
+
+        Args:
+            from_block (int): First block in the range.
+            to_block (int): Last block in the range.
+
+        Returns:
+            AttributeDict[]: Raw log entries.
+        """
+
+        logs = self.w3.eth.getLogs({
+            'fromBlock': from_block,
+            'toBlock': to_block,
+            'address': self.root_chain.address,
+            'topics': [[encode_hex(topic) for topic in self._event_abis]],
+        })
+        return sorted(logs, key=lambda log: (log['blockNumber'], log['logIndex']))
+
+    def _call(self, func, *args):
+        """Runs a blocking call in the event loop's default executor"""
+        return asyncio.get_event_loop().run_in_executor(None, functools.partial(func, *args))
+
+    def _handle_deposit(self, args):
+        """Adds the deposit block created by a DepositCreated event, or keeps it until the chain reaches it"""
+        deposit_tx = Transaction(inputs=[], outputs=[(args['owner'], args['amount'])])
+        self.child_chain.add_deposit(Block(transactions=[deposit_tx], number=args['depositBlock'], merkle_depth=self.child_chain.merkle_depth))
+
+    def _handle_root(self, args):
+        """Records the root committed by a PlasmaBlockRootCommitted event"""
+        self.child_chain.add_root(args['blockNumber'], args['root'])
+
+    def _handle_exit(self, args):
+        """Records the output being exited by an ExitStarted event, along with challenge data if it was spent and confirmed"""
+        utxo_position = args['utxoPosition']
+        self.exits[utxo_position] = TransactionOutput(args['owner'], args['amount'])
+
+        challenge_data = self.child_chain.get_challenge_data(utxo_position)
+        if challenge_data is not None:
+            self.challenges[utxo_position] = challenge_data
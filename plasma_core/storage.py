@@ -0,0 +1,434 @@
+import sqlite3
+import rlp
+from plasma_core.block import Block
+from plasma_core.block_view import BlockView
+from plasma_core.transaction import TransactionOutput
+
+
+class MemoryStorage(object):
+    """Keeps the state of a child chain in memory.
+
+    Attributes:
+        blocks (dict): Mapping from block numbers to blocks.
+        utxos (dict): Mapping from positions to unspent outputs.
+        owner_utxos (dict): Mapping from owner addresses to the positions of their unspent outputs.
+        spends (dict): Mapping from spent output positions to the positions of the inputs spending them.
+        confirmations (dict): Mapping from transaction positions to confirmation signatures, by input index.
+        roots (dict): Mapping from block numbers to roots committed to the root chain.
+        deposits (dict): Mapping from block numbers to deposit blocks waiting to be connected.
+        meta (dict): Mapping from keys to integer values, such as checkpoints.
+        head (int): Number of the next block expected by the chain.
+        merkle_depth (int): Depth of the chain's block Merkle trees.
+    """
+
+    def __init__(self, merkle_depth=Block.MERKLE_DEPTH):
+        self.merkle_depth = merkle_depth
+        self.blocks = {}
+        self.utxos = {}
+        self.owner_utxos = {}
+        self.spends = {}
+        self.confirmations = {}
+        self.roots = {}
+        self.deposits = {}
+        self.meta = {}
+        self.head = 1
+
+    def get_head(self):
+        """Returns the number of the next block expected by the chain"""
+        return self.head
+
+    def get_meta(self, key, default=None):
+        """Returns an integer value stored under a key.
+
+        Args:
+            key (str): Key to query.
+            default (int): Value to return if nothing is stored under the key.
+
+        Returns:
+            int: Stored value, or the default.
+        """
+
+        return self.meta.get(key, default)
+
+    def set_meta(self, key, value):
+        """Stores an integer value under a key.
+
+        Args:
+            key (str): Key to store the value under.
+            value (int): Value to store.
+        """
+
+        self.meta[key] = value
+
+    def get_root(self, blknum):
+        """Returns the root committed to the root chain for a block.
+
+        Args:
+            blknum (int): Block number to query.
+
+        Returns:
+            bytes: Committed root, or None if no root was committed.
+        """
+
+        return self.roots.get(blknum)
+
+    def add_root(self, blknum, root):
+        """Stores the root committed to the root chain for a block.
+
+        Args:
+            blknum (int): Number of the block.
+            root (bytes): Committed root.
+        """
+
+        self.roots[blknum] = root
+
+    def get_deposit(self, blknum):
+        """Returns a deposit block waiting to be connected.
+
+        Args:
+            blknum (int): Block number to query.
+
+        Returns:
+            Block: Waiting deposit block, or None if there isn't one.
+        """
+
+        return self.deposits.get(blknum)
+
+    def add_deposit(self, block):
+        """Stores a deposit block until the chain reaches it.
+
+        Args:
+            block (Block): Deposit block to store.
+        """
+
+        self.deposits[block.number] = block
+
+    def get_block(self, blknum):
+        """Returns the block for a given block number.
+
+        Args:
+            blknum (int): Block number to query.
+
+        Returns:
+            Block: Corresponding block object.
+        """
+
+        return self.blocks[blknum]
+
+    def get_utxo(self, utxo_position):
+        """Returns the unspent output at a given position.
+
+        Args:
+            utxo_position (int): Output position to query.
+
+        Returns:
+            TransactionOutput: Corresponding output, or None if it doesn't exist or was spent.
+        """
+
+        return self.utxos.get(utxo_position)
+
+    def get_utxo_positions(self, owner):
+        """Returns the positions of all unspent outputs owned by an address.
+
+        Args:
+            owner (bytes): Address of the owner.
+
+        Returns:
+            int[]: Output positions, in no particular order.
+        """
+
+        return list(self.owner_utxos.get(owner, ()))
+
+    def get_spend(self, utxo_position):
+        """Returns the position of the input that spent an output.
+
+        Args:
+            utxo_position (int): Output position to query.
+
+        Returns:
+            int: Position of the spending input, or None if the output wasn't spent.
+        """
+
+        return self.spends.get(utxo_position)
+
+    def get_confirmations(self, tx_position):
+        """Returns the confirmation signatures known for a transaction.
+
+        Args:
+            tx_position (int): Position of the transaction, with an output index of 0.
+
+        Returns:
+            dict: Mapping from input indices to confirmation signatures.
+        """
+
+        return dict(self.confirmations.get(tx_position, {}))
+
+    def add_confirmation(self, tx_position, index, confirmation):
+        """Stores a confirmation signature for one of a transaction's inputs.
+
+        Args:
+            tx_position (int): Position of the transaction, with an output index of 0.
+            index (int): Index of the confirmed input.
+            confirmation (bytes): Confirmation signature.
+        """
+
+        self.confirmations.setdefault(tx_position, {})[index] = confirmation
+
+    def commit_block(self, block, spends, created_utxos, head):
+        """Stores a block along with the changes it makes to the UTXO set.
+
+        Args:
+            block (Block): Block to store.
+            spends (dict): Mapping from positions of the outputs spent by the block to the positions of the spending inputs.
+            created_utxos (dict): Mapping from positions to outputs created by the block.
+            head (int): Number of the next block expected by the chain.
+        """
+
+        self.spends.update(spends)
+        for utxo_position in spends:
+            output = self.utxos.pop(utxo_position, None)
+            if output is None:
+                continue
+            positions = self.owner_utxos[output.owner]
+            positions.discard(utxo_position)
+            if not positions:
+                del self.owner_utxos[output.owner]
+
+        for utxo_position, output in created_utxos.items():
+            self.utxos[utxo_position] = output
+            self.owner_utxos.setdefault(output.owner, set()).add(utxo_position)
+
+        self.blocks[block.number] = block
+        self.deposits.pop(block.number, None)
+        self.head = head
+
+    def close(self):
+        """Releases any resources held by the storage"""
+        pass
+
+
+class SQLiteStorage(object):
+    """Keeps the state of a child chain in an SQLite database.
+
+    Blocks are stored RLP encoded and decoded whenever they're read, or
+    returned as a BlockView over the encoded bytes if lazy_blocks is set.
+    The UTXO set and chain head are kept in their own tables so that
+    reopening the database doesn't require replaying the chain.
+
+    Attributes:
+        path (str): Path to the database file.
+        lazy_blocks (bool): Whether blocks are read as views that decode transactions on demand.
+        merkle_depth (int): Depth of the chain's block Merkle trees, recorded when the database is created.
+        connection (sqlite3.Connection): Open database connection.
+    """
+
+    def __init__(self, path, lazy_blocks=False, merkle_depth=Block.MERKLE_DEPTH):
+        self.path = path
+        self.lazy_blocks = lazy_blocks
+        self.merkle_depth = merkle_depth
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.execute('CREATE TABLE IF NOT EXISTS blocks (number INTEGER PRIMARY KEY, data BLOB NOT NULL)')
+            self.connection.execute('CREATE TABLE IF NOT EXISTS utxos (position INTEGER PRIMARY KEY, owner BLOB NOT NULL, amount TEXT NOT NULL)')
+            self.connection.execute('CREATE INDEX IF NOT EXISTS utxos_owner ON utxos (owner)')
+            self.connection.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+            self.connection.execute('CREATE TABLE IF NOT EXISTS roots (number INTEGER PRIMARY KEY, root BLOB NOT NULL)')
+            self.connection.execute('CREATE TABLE IF NOT EXISTS deposits (number INTEGER PRIMARY KEY, data BLOB NOT NULL)')
+            self.connection.execute('CREATE TABLE IF NOT EXISTS spends (position INTEGER PRIMARY KEY, spending_position INTEGER NOT NULL)')
+            self.connection.execute('CREATE TABLE IF NOT EXISTS confirmations (position INTEGER NOT NULL, input_index INTEGER NOT NULL, signature BLOB NOT NULL, PRIMARY KEY (position, input_index))')
+
+        stored_depth = self.get_meta('merkle_depth')
+        if stored_depth is None:
+            self.set_meta('merkle_depth', merkle_depth)
+        elif stored_depth != merkle_depth:
+            self.connection.close()
+            raise ValueError('database was created with merkle depth {0}, not {1}'.format(stored_depth, merkle_depth))
+
+    def get_head(self):
+        """Returns the number of the next block expected by the chain"""
+        return self.get_meta('head', 1)
+
+    def get_meta(self, key, default=None):
+        """Returns an integer value stored under a key.
+
+        Args:
+            key (str): Key to query.
+            default (int): Value to return if nothing is stored under the key.
+
+        Returns:
+            int: Stored value, or the default.
+        """
+
+        row = self.connection.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        """Stores an integer value under a key.
+
+        Args:
+            key (str): Key to store the value under.
+            value (int): Value to store.
+        """
+
+        with self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    def get_root(self, blknum):
+        """Returns the root committed to the root chain for a block.
+
+        Args:
+            blknum (int): Block number to query.
+
+        Returns:
+            bytes: Committed root, or None if no root was committed.
+        """
+
+        row = self.connection.execute('SELECT root FROM roots WHERE number = ?', (blknum,)).fetchone()
+        return row[0] if row else None
+
+    def add_root(self, blknum, root):
+        """Stores the root committed to the root chain for a block.
+
+        Args:
+            blknum (int): Number of the block.
+            root (bytes): Committed root.
+        """
+
+        with self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO roots (number, root) VALUES (?, ?)', (blknum, root))
+
+    def get_deposit(self, blknum):
+        """Returns a deposit block waiting to be connected.
+
+        Args:
+            blknum (int): Block number to query.
+
+        Returns:
+            Block: Waiting deposit block, or None if there isn't one.
+        """
+
+        row = self.connection.execute('SELECT data FROM deposits WHERE number = ?', (blknum,)).fetchone()
+        return Block.deserialize(rlp.decode(row[0]), self.merkle_depth) if row else None
+
+    def add_deposit(self, block):
+        """Stores a deposit block until the chain reaches it.
+
+        Args:
+            block (Block): Deposit block to store.
+        """
+
+        with self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO deposits (number, data) VALUES (?, ?)', (block.number, rlp.encode(block)))
+
+    def get_block(self, blknum):
+        """Returns the block for a given block number.
+
+        Args:
+            blknum (int): Block number to query.
+
+        Returns:
+            Block: Corresponding block object, or a BlockView if lazy_blocks is set.
+        """
+
+        row = self.connection.execute('SELECT data FROM blocks WHERE number = ?', (blknum,)).fetchone()
+        if row is None:
+            raise KeyError(blknum)
+        if self.lazy_blocks:
+            return BlockView(row[0], self.merkle_depth)
+        return Block.deserialize(rlp.decode(row[0]), self.merkle_depth)
+
+    def get_utxo(self, utxo_position):
+        """Returns the unspent output at a given position.
+
+        Args:
+            utxo_position (int): Output position to query.
+
+        Returns:
+            TransactionOutput: Corresponding output, or None if it doesn't exist or was spent.
+        """
+
+        row = self.connection.execute('SELECT owner, amount FROM utxos WHERE position = ?', (utxo_position,)).fetchone()
+        if row is None:
+            return None
+        return TransactionOutput(row[0], int(row[1]))
+
+    def get_utxo_positions(self, owner):
+        """Returns the positions of all unspent outputs owned by an address.
+
+        Args:
+            owner (bytes): Address of the owner.
+
+        Returns:
+            int[]: Output positions, in no particular order.
+        """
+
+        rows = self.connection.execute('SELECT position FROM utxos WHERE owner = ?', (owner,))
+        return [row[0] for row in rows]
+
+    def get_spend(self, utxo_position):
+        """Returns the position of the input that spent an output.
+
+        Args:
+            utxo_position (int): Output position to query.
+
+        Returns:
+            int: Position of the spending input, or None if the output wasn't spent.
+        """
+
+        row = self.connection.execute('SELECT spending_position FROM spends WHERE position = ?', (utxo_position,)).fetchone()
+        return row[0] if row else None
+
+    def get_confirmations(self, tx_position):
+        """Returns the confirmation signatures known for a transaction.
+
+        Args:
+            tx_position (int): Position of the transaction, with an output index of 0.
+
+        Returns:
+            dict: Mapping from input indices to confirmation signatures.
+        """
+
+        rows = self.connection.execute('SELECT input_index, signature FROM confirmations WHERE position = ?', (tx_position,))
+        return {input_index: bytes(signature) for (input_index, signature) in rows}
+
+    def add_confirmation(self, tx_position, index, confirmation):
+        """Stores a confirmation signature for one of a transaction's inputs.
+
+        Args:
+            tx_position (int): Position of the transaction, with an output index of 0.
+            index (int): Index of the confirmed input.
+            confirmation (bytes): Confirmation signature.
+        """
+
+        with self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO confirmations (position, input_index, signature) VALUES (?, ?, ?)',
+                                    (tx_position, index, confirmation))
+
+    def commit_block(self, block, spends, created_utxos, head):
+        """Stores a block along with the changes it makes to the UTXO set.
+
+        All of the changes are written in a single database transaction.
+
+        Args:
+            block (Block): Block to store.
+            spends (dict): Mapping from positions of the outputs spent by the block to the positions of the spending inputs.
+            created_utxos (dict): Mapping from positions to outputs created by the block.
+            head (int): Number of the next block expected by the chain.
+        """
+
+        with self.connection:
+            self.connection.executemany('DELETE FROM utxos WHERE position = ?',
+                                        [(utxo_position,) for utxo_position in spends])
+            self.connection.executemany('INSERT OR REPLACE INTO spends (position, spending_position) VALUES (?, ?)',
+                                        list(spends.items()))
+            self.connection.executemany('INSERT OR REPLACE INTO utxos (position, owner, amount) VALUES (?, ?, ?)',
+                                        [(utxo_position, output.owner, str(output.amount))
+                                         for utxo_position, output in created_utxos.items()])
+            self.connection.execute('INSERT OR REPLACE INTO blocks (number, data) VALUES (?, ?)',
+                                    (block.number, rlp.encode(block)))
+            self.connection.execute('DELETE FROM deposits WHERE number = ?', (block.number,))
+            self.connection.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', ('head', head))
+
+    def close(self):
+        """Closes the database connection"""
+        self.connection.close()
@@ -1,6 +1,8 @@
 import rlp
-from rlp.sedes import big_endian_int, binary, CountableList
+from collections import namedtuple
+from rlp.sedes import big_endian_int, binary, CountableList, List
 from ethereum import utils
+from plasma_core.utils import hashing
 from plasma_core.utils.signatures import sign, get_signer
 from plasma_core.utils.transactions import encode_utxo_position
 from plasma_core.constants import NULL_SIGNATURE, NULL_ADDRESS
@@ -24,25 +26,21 @@ def pad_list(to_pad, pad_value, required_length):
     return to_pad + [pad_value] * (required_length - len(to_pad))
 
 
-class TransactionInput(rlp.Serializable):
+class TransactionInput(namedtuple('TransactionInput', ['blknum', 'txindex', 'oindex'])):
     """Represents a transaction input.
 
+    Inputs are immutable tuples, so they serialize directly as RLP lists.
+
     Attributes:
         blknum (int): Block in which this input was created.
         txindex (int): Index in the block of the transaction that created this input.
         oindex (int): Index of the output in the transaction.
     """
 
-    fields = (
-        ('blknum', big_endian_int),
-        ('txindex', big_endian_int),
-        ('oindex', big_endian_int)
-    )
+    __slots__ = ()
 
-    def __init__(self, blknum=0, txindex=0, oindex=0):
-        self.blknum = blknum
-        self.txindex = txindex
-        self.oindex = oindex
+    def __new__(cls, blknum=0, txindex=0, oindex=0):
+        return super().__new__(cls, blknum, txindex, oindex)
 
     @property
     def position(self):
@@ -50,91 +48,191 @@ class TransactionInput(rlp.Serializable):
         return encode_utxo_position(self.blknum, self.txindex, self.oindex)
 
 
-class TransactionOutput(rlp.Serializable):
+class TransactionOutput(namedtuple('TransactionOutput', ['owner', 'amount'])):
     """Represents a transaction output.
 
+    Outputs are immutable tuples, so they serialize directly as RLP lists.
+
     Attributes:
         owner (bytes): Address of the owner of this output.
         amount (int): Amount represented by this output.
     """
 
-    fields = (
-        ('owner', utils.address),
-        ('amount', big_endian_int)
-    )
+    __slots__ = ()
+
+    def __new__(cls, owner=NULL_ADDRESS, amount=0):
+        return super().__new__(cls, utils.normalize_address(owner), amount)
 
-    def __init__(self, owner=NULL_ADDRESS, amount=0):
-        self.owner = utils.normalize_address(owner)
-        self.amount = amount
 
+NULL_INPUT = TransactionInput()
+NULL_OUTPUT = TransactionOutput()
 
-class Transaction(rlp.Serializable):
+
+class Transaction(object):
     """Represents a Plasma transaction
 
+    Transactions use __slots__ and share a single instance of the null
+    input and output, so that large numbers of them can be kept in memory.
+    The class can be used as an RLP sedes and encodes exactly like an
+    rlp.Serializable with the same fields.
+
+    Encodings and hashes are cached. Assigning a field, signing or
+    confirming clears only the cached values that depend on it. Every
+    field is stored as a tuple, so it can't be changed in place without
+    clearing those values. Listeners, such as the blocks that include the
+    transaction, are notified whenever its Merkle leaf data changes.
+
     Attributes:
-        inputs ((int, int,int)[]): List of inputs to this transaction.
-        outputs ((bytes, int)[]): List of outputs created by this transaction.
-        signatures (bytes[]): List of signatures over this transaction.
+        inputs (TransactionInput[]): Inputs to this transaction.
+        outputs (TransactionOutput[]): Outputs created by this transaction.
+        signatures (bytes[]): Tuple of signatures over this transaction.
+        confirmations (bytes[]): Tuple of confirmation signatures over this transaction.
     """
 
     NUM_TXOS = 2
     DEFAULT_INPUT = (0, 0, 0)
     DEFAULT_OUTPUT = (NULL_ADDRESS, 0)
     fields = (
-        ('inputs', CountableList(TransactionInput, NUM_TXOS)),
-        ('outputs', CountableList(TransactionOutput, NUM_TXOS)),
+        ('inputs', CountableList(List([big_endian_int, big_endian_int, big_endian_int]), NUM_TXOS)),
+        ('outputs', CountableList(List([utils.address, big_endian_int]), NUM_TXOS)),
         ('signatures', CountableList(binary, NUM_TXOS))
     )
+    _sedes = List([sedes for _, sedes in fields])
+
+    __slots__ = (
+        'inputs',
+        'outputs',
+        'signatures',
+        'confirmations',
+        '_signer_cache',
+        '_encoded',
+        '_hash',
+        '_confirmation_hash',
+        '_joined_signatures',
+        '_merkle_leaf_data',
+        '_joined_confirmations',
+        '_listeners',
+    )
 
     def __init__(self, inputs=[], outputs=[], signatures=[], confirmations=[]):
-        inputs = inputs or [self.DEFAULT_INPUT] * self.NUM_TXOS
-        outputs = outputs or [self.DEFAULT_OUTPUT] * self.NUM_TXOS
-        signatures = signatures or [NULL_SIGNATURE] * self.NUM_TXOS
-        confirmations = confirmations or [NULL_SIGNATURE] * self.NUM_TXOS
+        self._listeners = None
+        self.inputs = inputs
+        self.outputs = outputs
+        self.signatures = signatures or [NULL_SIGNATURE] * self.NUM_TXOS
+        self.confirmations = confirmations or [NULL_SIGNATURE] * self.NUM_TXOS
+        self._signer_cache = None
+
+    def __setattr__(self, attr, value):
+        # Fields are padded and stored as tuples however they're assigned.
+        if attr == 'inputs':
+            padded_inputs = pad_list(list(value), self.DEFAULT_INPUT, self.NUM_TXOS)
+            value = tuple(NULL_INPUT if tuple(i) == NULL_INPUT else TransactionInput(*i) for i in padded_inputs)
+        elif attr == 'outputs':
+            padded_outputs = pad_list(list(value), self.DEFAULT_OUTPUT, self.NUM_TXOS)
+            value = tuple(NULL_OUTPUT if tuple(o) == NULL_OUTPUT else TransactionOutput(*o) for o in padded_outputs)
+        elif attr == 'signatures':
+            value = tuple(NULL_SIGNATURE if sig == NULL_SIGNATURE else sig for sig in value)
+        elif attr == 'confirmations':
+            value = tuple(value)
+        super().__setattr__(attr, value)
+
+        if attr in ('inputs', 'outputs'):
+            self._clear_unsigned_cache()
+        elif attr == 'signatures':
+            self._clear_signature_cache()
+        elif attr == 'confirmations':
+            self._joined_confirmations = None
+
+    def __eq__(self, other):
+        """Two transactions are equal if they serialize to the same data"""
+        if not isinstance(other, Transaction):
+            return False
+        return self.merkle_leaf_data == other.merkle_leaf_data
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    @classmethod
+    def serialize(cls, obj):
+        """Serializes a transaction so that it can be RLP encoded.
+
+        Args:
+            obj (Transaction): Transaction to serialize.
 
-        padded_inputs = pad_list(inputs, self.DEFAULT_INPUT, self.NUM_TXOS)
-        padded_outputs = pad_list(outputs, self.DEFAULT_OUTPUT, self.NUM_TXOS)
+        Returns:
+            list: Nested lists of inputs, outputs and signatures.
+        """
+
+        return cls._sedes.serialize([obj.inputs, obj.outputs, obj.signatures])
+
+    @classmethod
+    def deserialize(cls, serial, **kwargs):
+        """Creates a transaction from its serialized (but not RLP encoded) form.
+
+        Args:
+            serial (list): Nested lists of inputs, outputs and signatures.
+
+        Returns:
+            Transaction: Decoded transaction.
+        """
 
-        self.inputs = [TransactionInput(*i) for i in padded_inputs]
-        self.outputs = [TransactionOutput(*o) for o in padded_outputs]
-        self.signatures = signatures[:]
-        self.confirmations = confirmations[:]
-        self.spent = [False] * self.NUM_TXOS
+        (inputs, outputs, signatures) = cls._sedes.deserialize(serial)
+        return cls(inputs, outputs, signatures)
 
     @property
     def merkle_leaf_data(self):
         """RLP encoding of this transaction concatenated with its signatures"""
-        return self.encoded + self.joined_signatures
+        if self._merkle_leaf_data is None:
+            self._merkle_leaf_data = self.encoded + self.joined_signatures
+        return self._merkle_leaf_data
 
     @property
     def hash(self):
         """Hash of the RLP encoding of this transaction"""
-        return utils.sha3(self.encoded)
+        if self._hash is None:
+            self._hash = hashing.keccak(self.encoded)
+        return self._hash
 
     @property
     def confirmation_hash(self):
         """Double of the RLP encoding of this transaction"""
-        return utils.sha3(self.hash)
+        if self._confirmation_hash is None:
+            self._confirmation_hash = hashing.keccak(self.hash)
+        return self._confirmation_hash
 
     @property
     def joined_signatures(self):
         """Transaction signatures joined into a single byte string"""
-        return b''.join(self.signatures)
+        if self._joined_signatures is None:
+            self._joined_signatures = b''.join(self.signatures)
+        return self._joined_signatures
 
     @property
     def joined_confirmations(self):
         """Confirmation signatures joined into a single byte string"""
-        return b''.join(self.confirmations)
+        if self._joined_confirmations is None:
+            self._joined_confirmations = b''.join(self.confirmations)
+        return self._joined_confirmations
 
     @property
     def signers(self):
-        """List of addresses that have signed this transaction"""
-        return [get_signer(self.hash, sig) if sig != NULL_SIGNATURE else NULL_ADDRESS for sig in self.signatures]
+        """List of addresses that have signed this transaction.
+
+        Recovered addresses are cached by transaction hash and signature,
+        so each signature is only recovered once.
+        """
+
+        tx_hash = self.hash
+        return [self._get_signer(tx_hash, sig) for sig in self.signatures]
 
     @property
     def encoded(self):
         """RLP encoded representation of this transaction"""
-        return rlp.encode(self, UnsignedTransaction)
+        if self._encoded is None:
+            self._encoded = rlp.encode(self, UnsignedTransaction)
+        return self._encoded
 
     @property
     def is_deposit(self):
@@ -149,7 +247,7 @@ class Transaction(rlp.Serializable):
             key (bytes): Private key to be used to sign.
         """
 
-        self.signatures[index] = sign(self.hash, key)
+        self.signatures = self._replace(self.signatures, index, sign(self.hash, key))
 
     def confirm(self, index, key):
         """Adds a confirmation signature for this transaction.
@@ -159,7 +257,97 @@ class Transaction(rlp.Serializable):
             key (bytes): Private key to be used to sign.
         """
 
-        self.confirmations[index] = sign(self.confirmation_hash, key)
+        self.confirmations = self._replace(self.confirmations, index, sign(self.confirmation_hash, key))
+
+    def cache_signers(self, signers):
+        """Stores signers that were recovered outside of this transaction.
+
+        Args:
+            signers (bytes[]): Address of the signer for each signature.
+        """
+
+        if self._signer_cache is None:
+            self._signer_cache = {}
+
+        tx_hash = self.hash
+        for signature, signer in zip(self.signatures, signers):
+            if signature != NULL_SIGNATURE:
+                self._signer_cache[(tx_hash, signature)] = signer
+
+    def add_listener(self, listener):
+        """Registers an object to tell whenever this transaction's Merkle leaf data changes.
+
+        Listeners are told by calling their transaction_changed method with
+        the transaction. They're held by weak references, so listening to a
+        transaction doesn't keep them alive.
+
+        Args:
+            listener (weakref.ref): Weak reference to the listener.
+        """
+
+        if self._listeners is None:
+            self._listeners = [listener]
+            return
+
+        # Compare by identity, blocks compare equal by their encoding.
+        listeners = [ref for ref in self._listeners if ref is not listener and ref() is not None]
+        listeners.append(listener)
+        self._listeners = listeners
+
+    def _replace(self, values, index, value):
+        """Returns a copy of a tuple with the value at an index replaced"""
+        values = list(values)
+        values[index] = value
+        return tuple(values)
+
+    def _clear_unsigned_cache(self):
+        """Clears every cached value that depends on the inputs or outputs"""
+
+        self._encoded = None
+        self._hash = None
+        self._confirmation_hash = None
+        self._clear_signature_cache()
+
+    def _clear_signature_cache(self):
+        """Clears every cached value that depends on the signatures"""
+
+        self._joined_signatures = None
+        self._merkle_leaf_data = None
+        if self._listeners:
+            self._notify_listeners()
+
+    def _notify_listeners(self):
+        """Tells every listener that is still alive that this transaction changed and forgets the others"""
+
+        listeners = []
+        for ref in self._listeners:
+            listener = ref()
+            if listener is not None:
+                listener.transaction_changed(self)
+                listeners.append(ref)
+        self._listeners = listeners
+
+    def _get_signer(self, tx_hash, signature):
+        """Returns the address that created a signature, recovering it at most once.
+
+        Args:
+            tx_hash (bytes): Hash that was signed.
+            signature (bytes): Signature over the hash.
+
+        Returns:
+            bytes: Address of the signer.
+        """
+
+        if signature == NULL_SIGNATURE:
+            return NULL_ADDRESS
+
+        if self._signer_cache is None:
+            self._signer_cache = {}
+
+        key = (tx_hash, signature)
+        if key not in self._signer_cache:
+            self._signer_cache[key] = get_signer(tx_hash, signature)
+        return self._signer_cache[key]
 
 
 class UnsignedTransaction(rlp.Serializable):
@@ -1,11 +1,15 @@
 import os
 import json
-from solc import compile_standard
+import hashlib
+from solc import compile_standard, get_solc_version_string
 from web3 import Web3, HTTPProvider
 from web3.contract import ConciseContract
 
 
 OUTPUT_DIR = 'contract_data'
+COMPILE_HASH_PATH = OUTPUT_DIR + '/compile_hash.json'
+
+_contract_data_cache = {}
 
 
 class Deployer(object):
@@ -51,16 +55,46 @@ class Deployer(object):
 
         return solc_input
 
+    def get_compile_hash(self, solc_input):
+        """Hashes everything that affects the output of a compilation
+
+        Args:
+            solc_input (dict): A Solidity input JSON object as a dict
+
+        Returns:
+            str: Hex encoded hash of the compiler version, settings and sources
+        """
+
+        compile_hash = hashlib.sha256()
+        compile_hash.update(get_solc_version_string().encode())
+        compile_hash.update(json.dumps(solc_input['settings'], sort_keys=True).encode())
+        for file_name in sorted(solc_input['sources']):
+            compile_hash.update(file_name.encode())
+            for url in solc_input['sources'][file_name]['urls']:
+                with open(url, 'rb') as source_file:
+                    compile_hash.update(hashlib.sha256(source_file.read()).digest())
+        return compile_hash.hexdigest()
+
     def compile_all(self):
         """Compiles all of the contracts in the /contracts directory
 
         Creates {contract name}.json files in /build that contain
-        the build output for each contract.
+        the build output for each contract. Compilation is skipped if
+        the compiler, settings and sources haven't changed since the
+        output was last written.
+
+        Returns:
+            bool: True if the contracts were compiled, False if the existing output was reused
         """
 
         # Solidity input JSON
         solc_input = self.get_solc_input()
 
+        # Skip compiling if the existing output came from the same input
+        compile_hash = self.get_compile_hash(solc_input)
+        if self._read_compile_hash() == compile_hash:
+            return False
+
         # Compile the contracts
         compilation_result = compile_standard(solc_input, allow_paths=self.contracts_dir)
 
@@ -69,19 +103,50 @@ class Deployer(object):
 
         # Write the contract ABI to output files
         compiled_contracts = compilation_result['contracts']
+        contract_names = []
         for contract_file in compiled_contracts:
             for contract in compiled_contracts[contract_file]:
                 contract_name = contract.split('.')[0]
                 contract_data = compiled_contracts[contract_file][contract_name]
+                contract_names.append(contract_name)
 
                 contract_data_path = OUTPUT_DIR + '/{0}.json'.format(contract_name)
                 with open(contract_data_path, "w+") as contract_data_file:
                     json.dump(contract_data, contract_data_file)
 
+        # Record the hash last, so that an interrupted compilation is redone
+        with open(COMPILE_HASH_PATH, 'w+') as compile_hash_file:
+            json.dump({'hash': compile_hash, 'contracts': contract_names}, compile_hash_file)
+
+        _contract_data_cache.clear()
+        return True
+
+    @staticmethod
+    def _read_compile_hash():
+        """Returns the hash of the input that produced the existing output
+
+        Returns:
+            str: Hash recorded by the last compilation, or None if any output is missing
+        """
+
+        try:
+            with open(COMPILE_HASH_PATH, 'r') as compile_hash_file:
+                compile_info = json.load(compile_hash_file)
+        except (OSError, ValueError):
+            return None
+
+        for contract_name in compile_info['contracts']:
+            if not os.path.exists(OUTPUT_DIR + '/{0}.json'.format(contract_name)):
+                return None
+        return compile_info['hash']
+
     @staticmethod
     def get_contract_data(contract_name):
         """Returns the contract data for a given contract
 
+        Contract data is read from disk once per process and cached
+        until the contracts are compiled again.
+
         Args:
             contract_name (str): Name of the contract to return.
 
@@ -89,14 +154,16 @@ class Deployer(object):
             str, str: ABI and bytecode of the contract
         """
 
-        contract_data_path = OUTPUT_DIR + '/{0}.json'.format(contract_name)
-        with open(contract_data_path, 'r') as contract_data_file:
-            contract_data = json.load(contract_data_file)
+        if contract_name not in _contract_data_cache:
+            contract_data_path = OUTPUT_DIR + '/{0}.json'.format(contract_name)
+            with open(contract_data_path, 'r') as contract_data_file:
+                contract_data = json.load(contract_data_file)
 
-        abi = contract_data['abi']
-        bytecode = contract_data['evm']['bytecode']['object']
+            abi = contract_data['abi']
+            bytecode = contract_data['evm']['bytecode']['object']
+            _contract_data_cache[contract_name] = (abi, bytecode)
 
-        return abi, bytecode
+        return _contract_data_cache[contract_name]
 
     def deploy_contract(self, contract_name, gas=5000000, args=(), concise=True):
         """Deploys a contract to the given Ethereum network using Web3
@@ -0,0 +1,131 @@
+from collections import OrderedDict
+
+
+class KeccakBackend(object):
+    """Keccak-256 implementation provided by a specific package.
+
+    Attributes:
+        name (str): Name of the backend.
+        keccak (function): Returns the 32 byte digest of some data.
+        keccak_batch (function): Returns the digest of each item in a list of data.
+    """
+
+    def __init__(self, name, keccak, keccak_batch):
+        self.name = name
+        self.keccak = keccak
+        self.keccak_batch = keccak_batch
+
+
+def _load_pysha3():
+    from sha3 import keccak_256
+
+    def keccak(data):
+        return keccak_256(data).digest()
+
+    def keccak_batch(inputs):
+        return [keccak_256(data).digest() for data in inputs]
+
+    return KeccakBackend('pysha3', keccak, keccak_batch)
+
+
+def _load_pycryptodome():
+    from Crypto.Hash.keccak import new
+
+    def keccak(data):
+        return new(digest_bits=256, data=data).digest()
+
+    def keccak_batch(inputs):
+        return [new(digest_bits=256, data=data).digest() for data in inputs]
+
+    return KeccakBackend('pycryptodome', keccak, keccak_batch)
+
+
+def _load_pyethereum():
+    from ethereum.utils import sha3
+
+    def keccak_batch(inputs):
+        return [sha3(data) for data in inputs]
+
+    return KeccakBackend('pyethereum', sha3, keccak_batch)
+
+
+# Ordered fastest first, see the hashing benchmarks in benchmarks/bench_plasma_core.py.
+BACKENDS = OrderedDict([
+    ('pysha3', _load_pysha3),
+    ('pycryptodome', _load_pycryptodome),
+    ('pyethereum', _load_pyethereum),
+])
+
+
+def load_backend(name):
+    """Loads a backend without selecting it.
+
+    Args:
+        name (str): Name of the backend.
+
+    Returns:
+        KeccakBackend: Loaded backend.
+    """
+
+    if name not in BACKENDS:
+        raise ValueError('unknown keccak backend {0}'.format(name))
+    return BACKENDS[name]()
+
+
+def get_available_backends():
+    """Returns the names of the backends that can be loaded, fastest first"""
+    available = []
+    for name in BACKENDS:
+        try:
+            load_backend(name)
+        except ImportError:
+            continue
+        available.append(name)
+    return available
+
+
+def set_backend(name):
+    """Selects the backend used by keccak, keccak_batch and keccak_chunks.
+
+    Callers should look the functions up on this module, as in
+    hashing.keccak(data), so that the selection applies everywhere.
+
+    Args:
+        name (str): Name of the backend.
+    """
+
+    global backend, keccak, keccak_batch
+    backend = load_backend(name)
+    keccak = backend.keccak
+    keccak_batch = backend.keccak_batch
+
+
+def keccak_chunks(data, chunk_size):
+    """Hashes consecutive chunks of some data, such as the pairs of sibling nodes in a Merkle level.
+
+    Args:
+        data (bytes): Data to split into chunks.
+        chunk_size (int): Size of each chunk, the last one may be shorter.
+
+    Returns:
+        bytes: Concatenated digests of the chunks.
+    """
+
+    return b''.join(keccak_batch([data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]))
+
+
+def _select_fastest_backend():
+    """Selects the first backend that can be loaded. pyethereum is always installed, so one always can."""
+    for name in BACKENDS:
+        try:
+            set_backend(name)
+        except ImportError:
+            continue
+        return
+
+
+backend = None
+keccak = None
+keccak_batch = None
+
+_select_fastest_backend()
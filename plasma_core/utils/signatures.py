@@ -1,4 +1,6 @@
 from ethereum import utils
+from plasma_core.utils import hashing
+from plasma_core.constants import NULL_SIGNATURE, NULL_ADDRESS
 
 
 def sign(hash, key):
@@ -15,4 +17,8 @@ def get_signer(hash, sig):
     r = utils.bytes_to_int(sig[:32])
     s = utils.bytes_to_int(sig[32:64])
     pub = utils.ecrecover_to_pub(hash, v, r, s)
-    return utils.sha3(pub)[-20:]
+    return hashing.keccak(pub)[-20:]
+
+
+def get_signers(hash, sigs):
+    return [get_signer(hash, sig) if sig != NULL_SIGNATURE else NULL_ADDRESS for sig in sigs]
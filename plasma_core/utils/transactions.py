@@ -1,10 +1,13 @@
 BLKNUM_OFFSET = 1000000000
 TXINDEX_OFFSET = 10000
 
+# Deepest block Merkle tree whose transaction indices all fit between the block number and the output index.
+MAX_MERKLE_DEPTH = (BLKNUM_OFFSET // TXINDEX_OFFSET).bit_length() - 1
+
 
 def decode_utxo_position(utxo_position):
     blknum = utxo_position // BLKNUM_OFFSET
-    txindex = (utxo_position % BLKNUM_OFFSET) // BLKNUM_OFFSET
+    txindex = (utxo_position % BLKNUM_OFFSET) // TXINDEX_OFFSET
     oindex = utxo_position - blknum * BLKNUM_OFFSET - txindex * TXINDEX_OFFSET
     return (blknum, txindex, oindex)
 
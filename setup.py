@@ -27,5 +27,8 @@ setup(
         'rlp==0.6.0',
         'py-solc==3.1.0',
         'web3==4.4.1'
-    ]
+    ],
+    extras_require={
+        'fast': ['pysha3==1.0.2']
+    }
 )
@@ -0,0 +1,70 @@
+import os
+from ethereum import utils
+from ethereum.abi import ContractTranslator
+from ethereum.tools import tester
+from ethereum.config import config_metropolis
+from plasma_core.account import EthereumAccount
+from plasma_core.block import Block
+from plasma_core.utils.deployer import Deployer
+from plasma_core.utils.address import address_to_hex
+
+
+GAS_LIMIT = 8000000
+START_GAS = GAS_LIMIT - 1000000
+config_metropolis['BLOCK_GAS_LIMIT'] = GAS_LIMIT
+
+
+OWN_DIR = os.path.dirname(os.path.realpath(__file__))
+CONTRACTS_DIR = os.path.abspath(os.path.realpath(os.path.join(OWN_DIR, '../plasma/contracts')))
+deployer = Deployer(CONTRACTS_DIR)
+
+
+def setup_accounts(ethtester):
+    """Creates an EthereumAccount for each of the tester's prefunded accounts.
+
+    Args:
+        ethtester (tester): Ethereum tester module.
+    """
+
+    ethtester.accounts = []
+    for i in range(10):
+        address = getattr(ethtester, 'a{0}'.format(i))
+        key = getattr(ethtester, 'k{0}'.format(i))
+        ethtester.accounts.append(EthereumAccount(address_to_hex(address), key))
+
+
+def deploy_contract(chain, path, args=(), sender=tester.k0):
+    """Deploys a compiled contract to a tester chain.
+
+    Args:
+        chain (Chain): Chain to deploy to.
+        path (str): Name of the contract.
+        args (tuple): Constructor arguments.
+        sender (bytes): Private key of the deployer.
+
+    Returns:
+        ABIContract: Deployed contract.
+    """
+
+    abi, hexcode = deployer.get_contract_data(path)
+    bytecode = utils.decode_hex(hexcode)
+    encoded_args = (ContractTranslator(abi).encode_constructor_arguments(args) if args else b'')
+    code = bytecode + encoded_args
+    address = chain.tx(sender=sender, to=b'', startgas=START_GAS, data=code)
+    return tester.ABIContract(chain, abi, address)
+
+
+def deploy_root_chain(chain, merkle_depth=Block.MERKLE_DEPTH):
+    """Deploys the root chain contract and mines it into a block.
+
+    Args:
+        chain (Chain): Chain to deploy to.
+        merkle_depth (int): Depth of the chain's block Merkle trees.
+
+    Returns:
+        ABIContract: Deployed root chain contract.
+    """
+
+    contract = deploy_contract(chain, 'RootChain', (merkle_depth,))
+    chain.mine()
+    return contract
@@ -1,9 +1,12 @@
+import heapq
 from ethereum.utils import sha3
 from plasma_core.child_chain import ChildChain
+from plasma_core.mempool import Mempool
+from plasma_core.proof_cache import ProofCache
 from plasma_core.account import EthereumAccount
 from plasma_core.block import Block
 from plasma_core.transaction import Transaction
-from plasma_core.constants import NULL_ADDRESS
+from plasma_core.constants import NULL_ADDRESS, WEEKS
 from plasma_core.utils.signatures import sign
 from plasma_core.utils.transactions import decode_utxo_position, encode_utxo_position
 from plasma_core.utils.address import address_to_hex
@@ -39,6 +42,58 @@ class PlasmaBlock(object):
         self.timestamp = timestamp
 
 
+# Conservative gas estimates for processExitsBatch, see benchmarks/bench_root_chain_gas.py to measure them.
+PROCESS_EXITS_BASE_GAS = 50000
+PROCESS_EXIT_GAS = 100000
+PROCESS_EXITS_GAS_BUDGET = 3000000
+
+
+class PlasmaExitQueue(object):
+    """Mirrors the root chain's exit queue off-chain.
+
+    Attributes:
+        exits ((int, int)[]): Heap of (exitable at, UTXO position) pairs, in the contract's order.
+    """
+
+    def __init__(self):
+        self.exits = []
+
+    def __len__(self):
+        return len(self.exits)
+
+    def insert(self, exitable_at, utxo_position):
+        """Adds an exit to the queue.
+
+        Args:
+            exitable_at (int): Time when the exit can be processed.
+            utxo_position (int): Position of the UTXO being exited.
+        """
+
+        heapq.heappush(self.exits, (exitable_at, utxo_position))
+
+    def count_exitable(self, timestamp):
+        """Returns the number of exits the contract would process at a given time.
+
+        Args:
+            timestamp (int): Time to process exits at.
+
+        Returns:
+            int: Number of queued exits that have finished their challenge period.
+        """
+
+        return sum(1 for (exitable_at, _) in self.exits if exitable_at <= timestamp)
+
+    def remove(self, count):
+        """Removes exits from the front of the queue, as processing them does.
+
+        Args:
+            count (int): Number of exits to remove.
+        """
+
+        for _ in range(min(count, len(self.exits))):
+            heapq.heappop(self.exits)
+
+
 class TestingLanguage(object):
     """Represents the testing language.
 
@@ -48,6 +103,9 @@ class TestingLanguage(object):
         accounts (EthereumAccount[]): List of available accounts.
         operator (EthereumAccount): The operator's account.
         child_chain (ChildChain): Child chain instance.
+        mempool (Mempool): Operator's pool of pending transactions.
+        proofs (ProofCache): Membership proofs for committed blocks.
+        exit_queue (PlasmaExitQueue): Mirror of the exits started through this instance.
     """
 
     def __init__(self, root_chain, ethtester):
@@ -55,7 +113,10 @@ class TestingLanguage(object):
         self.ethtester = ethtester
         self.accounts = ethtester.accounts
         self.operator = self.accounts[0]
-        self.child_chain = ChildChain(self.accounts[0].address)
+        self.child_chain = ChildChain(self.accounts[0].address, merkle_depth=root_chain.merkleDepth())
+        self.mempool = Mempool(self.child_chain)
+        self.proofs = ProofCache(self.child_chain)
+        self.exit_queue = PlasmaExitQueue()
 
     @property
     def timestamp(self):
@@ -78,7 +139,8 @@ class TestingLanguage(object):
         signer = signer or self.operator
         block.sign(signer.key)
         self.root_chain.commitPlasmaBlockRoot(block.root, sender=signer.key)
-        self.child_chain.add_block(block)
+        if self.child_chain.add_block(block):
+            self.proofs.precompute(block)
 
     def deposit(self, owner, amount):
         """Creates a deposit transaction for a given owner and amount.
@@ -95,7 +157,7 @@ class TestingLanguage(object):
         blknum = self.root_chain.currentPlasmaBlockNumber()
         self.root_chain.deposit(value=amount, sender=owner.key)
 
-        block = Block(transactions=[deposit_tx], number=blknum)
+        block = Block(transactions=[deposit_tx], number=blknum, merkle_depth=self.child_chain.merkle_depth)
         self.child_chain.add_block(block)
         return blknum
 
@@ -116,10 +178,41 @@ class TestingLanguage(object):
         spend_tx.sign(0, signer.key)
 
         blknum = self.root_chain.currentPlasmaBlockNumber()
-        block = Block(transactions=[spend_tx], number=blknum)
+        block = Block(transactions=[spend_tx], number=blknum, merkle_depth=self.child_chain.merkle_depth)
         self.commit_plasma_block_root(block)
         return encode_utxo_position(blknum, 0, 0)
 
+    def submit_transaction(self, inputs, outputs, signers):
+        """Creates a spending transaction and adds it to the operator's mempool.
+
+        Args:
+            inputs ((int, int, int)[]): Inputs to the transaction.
+            outputs ((EthereumAccount, int)[]): New owners and amounts of the outputs.
+            signers (EthereumAccount[]): Accounts to sign each input.
+
+        Returns:
+            Transaction: The pending transaction.
+        """
+
+        tx = Transaction(inputs=inputs, outputs=[(owner.address, amount) for (owner, amount) in outputs])
+        for (index, signer) in enumerate(signers):
+            tx.sign(index, signer.key)
+        self.mempool.add_transaction(tx)
+        return tx
+
+    def commit_mempool_block(self):
+        """Builds a block from pending transactions and commits it.
+
+        Returns:
+            Block: The committed block.
+        """
+
+        blknum = self.root_chain.currentPlasmaBlockNumber()
+        block = self.mempool.build_block(blknum)
+        self.commit_plasma_block_root(block)
+        self.mempool.remove_block(block)
+        return block
+
     def confirm(self, tx_position, index, signer):
         """Signs a confirmation signature for a spend.
 
@@ -131,6 +224,7 @@ class TestingLanguage(object):
 
         spend_tx = self.child_chain.get_transaction(tx_position)
         spend_tx.confirm(index, signer.key)
+        self.child_chain.add_confirmation(tx_position, index, spend_tx.confirmations[index])
 
     def start_exit(self, owner, utxo_position):
         """Starts a standard exit.
@@ -143,6 +237,11 @@ class TestingLanguage(object):
         bond = self.root_chain.EXIT_BOND()
         self.root_chain.startExit(*decode_utxo_position(utxo_position), *self.get_exit_proof(utxo_position), sender=owner.key, value=bond)
 
+        # Mirror the contract's exit queue.
+        (blknum, _, _) = decode_utxo_position(utxo_position)
+        plasma_block = self.get_plasma_block(blknum)
+        self.exit_queue.insert(max(plasma_block.timestamp + 2 * WEEKS, self.timestamp + WEEKS), utxo_position)
+
     def get_exit_proof(self, utxo_position):
         """Returns information required to exit
 
@@ -153,47 +252,89 @@ class TestingLanguage(object):
             bytes, bytes, bytes, bytes: Information necessary to exit the UTXO.
         """
 
-        (blknum, _, _) = decode_utxo_position(utxo_position)
-        block = self.child_chain.get_block(blknum)
-
         spend_tx = self.child_chain.get_transaction(utxo_position)
         encoded_tx = spend_tx.encoded
-        proof = block.merkle.create_membership_proof(spend_tx.merkle_leaf_data)
+        proof = self.proofs.get_proof_for_position(utxo_position)
         signatures = spend_tx.joined_signatures
         confirmations = spend_tx.joined_confirmations
         return (encoded_tx, proof, signatures, confirmations)
 
-    def challenge_exit(self, exiting_utxo_position, spending_tx_position):
+    def challenge_exit(self, exiting_utxo_position, spending_tx_position=None):
         """Challenges an exit with a double spend.
 
         Args:
             exiting_utxo_position (int): Position of the UTXO being exited.
-            spending_tx_position (int): Position of the transaction that spent the UTXO.
+            spending_tx_position (int): Position of the transaction that spent the UTXO, looked up if not given.
         """
 
         proof_data = self.get_challenge_proof(exiting_utxo_position, spending_tx_position)
         self.root_chain.challengeExit(*decode_utxo_position(exiting_utxo_position), *proof_data)
 
-    def get_challenge_proof(self, exiting_utxo_position, spending_tx_position):
+    def get_challenge_proof(self, exiting_utxo_position, spending_tx_position=None):
         """Returns information required to submit a challenge.
 
         Args:
             exiting_utxo_position (int): Position of the UTXO being exited.
-            spending_tx_position (int): Position of the transaction that spent the UTXO.
+            spending_tx_position (int): Position of the transaction that spent the UTXO, looked up if not given.
 
         Returns:
             bytes, bytes: Information necessary to create a challenge proof.
         """
 
+        if spending_tx_position is None:
+            challenge_data = self.child_chain.get_challenge_data(exiting_utxo_position)
+            if challenge_data is None:
+                if self.child_chain.get_spending_position(exiting_utxo_position) is None:
+                    reason = 'it is unspent'
+                else:
+                    reason = 'its spend is not confirmed'
+                raise ValueError('cannot challenge the exit of {0}: {1}'.format(exiting_utxo_position, reason))
+            return challenge_data
+
         spend_tx = self.child_chain.get_transaction(spending_tx_position)
         (_, _, oindex) = decode_utxo_position(spending_tx_position)
         confirmation_signature = spend_tx.confirmations[oindex]
         return (spend_tx.encoded, confirmation_signature)
 
-    def process_exits(self):
-        """Processes any exits that have completed the exit period"""
+    def process_exits(self, max_exits=None):
+        """Processes any exits that have completed the exit period.
+
+        Args:
+            max_exits (int): Maximum number of exits to process, or None to process all of them.
+        """
+
+        exitable = self.exit_queue.count_exitable(self.timestamp)
+        if max_exits is None:
+            self.root_chain.processExits()
+        else:
+            self.root_chain.processExitsBatch(max_exits)
+            exitable = min(exitable, max_exits)
+        self.exit_queue.remove(exitable)
+
+    def process_exits_in_batches(self, gas_budget=PROCESS_EXITS_GAS_BUDGET, gas_per_exit=PROCESS_EXIT_GAS):
+        """Processes every exitable exit, in batches that fit a gas budget.
+
+        Batch sizes are picked from the mirrored exit queue, so only exits
+        started through this instance are accounted for.
+
+        Args:
+            gas_budget (int): Maximum gas for a single call.
+            gas_per_exit (int): Estimated gas used to process one exit.
+
+        Returns:
+            int[]: Number of exits processed by each call.
+        """
 
-        self.root_chain.processExits()
+        batch_size = max(1, (gas_budget - PROCESS_EXITS_BASE_GAS) // gas_per_exit)
+        batches = []
+        exitable = self.exit_queue.count_exitable(self.timestamp)
+        while exitable > 0:
+            batch = min(batch_size, exitable)
+            self.root_chain.processExitsBatch(batch, startgas=gas_budget)
+            self.exit_queue.remove(batch)
+            batches.append(batch)
+            exitable -= batch
+        return batches
 
     def get_plasma_block(self, blknum):
         """Queries a plasma block by its number.
@@ -1,24 +1,73 @@
-import os
 import pytest
 from ethereum import utils
-from ethereum.abi import ContractTranslator
 from ethereum.tools import tester
-from ethereum.config import config_metropolis
-from plasma_core.account import EthereumAccount
-from plasma_core.utils.deployer import Deployer
-from plasma_core.utils.address import address_to_hex
 from testlang.testlang import TestingLanguage
+from testlang.tester_chain import deployer, setup_accounts, deploy_contract, deploy_root_chain
 
 
-GAS_LIMIT = 8000000
-START_GAS = GAS_LIMIT - 1000000
-config_metropolis['BLOCK_GAS_LIMIT'] = GAS_LIMIT
+deployer.compile_all()
 
 
-OWN_DIR = os.path.dirname(os.path.realpath(__file__))
-CONTRACTS_DIR = os.path.abspath(os.path.realpath(os.path.join(OWN_DIR, '../plasma/contracts')))
-deployer = Deployer(CONTRACTS_DIR)
-deployer.compile_all()
+def pytest_addoption(parser):
+    parser.addoption('--stress', action='store_true', default=False, help='run long running stress tests')
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'fresh_chain: run the test on a new chain with a newly deployed root chain')
+    config.addinivalue_line('markers', 'stress: long running test, only run with --stress')
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--stress'):
+        return
+    skip_stress = pytest.mark.skip(reason='needs --stress to run')
+    for item in items:
+        if 'stress' in item.keywords:
+            item.add_marker(skip_stress)
+
+
+class SharedChain(object):
+    """Chain with a deployed root chain that's shared between tests.
+
+    Each test runs from a snapshot taken right after deployment, and the
+    chain is reverted once the test is done. Snapshots can't be reverted
+    across blocks, so the chain is recreated if a test mines a block.
+
+    Attributes:
+        chain (Chain): Shared chain, or None if it needs to be recreated.
+        root_chain (ABIContract): Root chain deployed on the shared chain.
+    """
+
+    def __init__(self):
+        self.chain = None
+        self.root_chain = None
+        self._snapshot = None
+
+    def checkout(self):
+        """Returns the shared chain, creating it if needed"""
+        if self.chain is None:
+            self.chain = tester.Chain()
+            self.root_chain = deploy_root_chain(self.chain)
+            self._snapshot = self.chain.snapshot()
+        return self.chain
+
+    def restore(self):
+        """Reverts the shared chain to its state right after deployment"""
+        (_, _, blknum) = self._snapshot
+        if self.chain.block.number == blknum:
+            self.chain.revert(self._snapshot)
+        else:
+            self.chain = None
+
+
+@pytest.fixture(scope='session')
+def shared_chain():
+    return SharedChain()
+
+
+@pytest.fixture
+def uses_fresh_chain(request):
+    return request.node.get_closest_marker('fresh_chain') is not None
 
 
 @pytest.fixture
@@ -27,33 +76,31 @@ def ethutils():
 
 
 @pytest.fixture
-def ethtester():
-    tester.chain = tester.Chain()
-    tester.accounts = []
-    for i in range(10):
-        address = getattr(tester, 'a{0}'.format(i))
-        key = getattr(tester, 'k{0}'.format(i))
-        tester.accounts.append(EthereumAccount(address_to_hex(address), key))
-    return tester
+def ethtester(shared_chain, uses_fresh_chain):
+    if uses_fresh_chain:
+        tester.chain = tester.Chain()
+    else:
+        tester.chain = shared_chain.checkout()
+    setup_accounts(tester)
+
+    yield tester
+
+    if not uses_fresh_chain:
+        shared_chain.restore()
 
 
 @pytest.fixture
-def get_contract(ethtester, ethutils):
+def get_contract(ethtester):
     def create_contract(path, args=(), sender=ethtester.k0):
-        abi, hexcode = deployer.get_contract_data(path)
-        bytecode = ethutils.decode_hex(hexcode)
-        encoded_args = (ContractTranslator(abi).encode_constructor_arguments(args) if args else b'')
-        code = bytecode + encoded_args
-        address = ethtester.chain.tx(sender=sender, to=b'', startgas=START_GAS, data=code)
-        return ethtester.ABIContract(ethtester.chain, abi, address)
+        return deploy_contract(ethtester.chain, path, args, sender)
     return create_contract
 
 
 @pytest.fixture
-def root_chain(ethtester, get_contract):
-    contract = get_contract('RootChain')
-    ethtester.chain.mine()
-    return contract
+def root_chain(ethtester, shared_chain, uses_fresh_chain):
+    if uses_fresh_chain:
+        return deploy_root_chain(ethtester.chain)
+    return shared_chain.root_chain
 
 
 @pytest.fixture
@@ -70,3 +70,35 @@ def test_challenge_exit_invalid_confirmation_signatures_should_fail(testlang):
         testlang.root_chain.challengeExit(*decode_utxo_position(exiting_utxo_position),
                                           encoded_tx,
                                           confirmation_signature)
+
+
+def test_challenge_exit_without_spending_position_should_succeed(testlang):
+    (deposit_utxo_position, spending_utxo_position) = start_exit_spend(testlang)
+
+    # The spending transaction is found from the exiting UTXO
+    assert testlang.child_chain.get_spending_position(deposit_utxo_position) == spending_utxo_position
+    testlang.challenge_exit(deposit_utxo_position)
+
+    plasma_exit = testlang.get_plasma_exit(deposit_utxo_position)
+    assert plasma_exit.is_valid == False
+
+
+def test_challenge_exit_without_spending_position_unspent_should_fail(testlang):
+    owner, amount = testlang.accounts[0], 100
+    deposit_blknum = testlang.deposit(owner, amount)
+    deposit_utxo_position = encode_utxo_position(deposit_blknum, 0, 0)
+    testlang.start_exit(owner, deposit_utxo_position)
+
+    with pytest.raises(ValueError, match='unspent'):
+        testlang.challenge_exit(deposit_utxo_position)
+
+
+def test_challenge_exit_without_spending_position_unconfirmed_should_fail(testlang):
+    owner, amount = testlang.accounts[0], 100
+    deposit_blknum = testlang.deposit(owner, amount)
+    deposit_utxo_position = encode_utxo_position(deposit_blknum, 0, 0)
+    testlang.start_exit(owner, deposit_utxo_position)
+    testlang.spend_utxo(deposit_utxo_position, owner, amount, owner)
+
+    with pytest.raises(ValueError, match='not confirmed'):
+        testlang.challenge_exit(deposit_utxo_position)
@@ -1,6 +1,9 @@
 import pytest
 from ethereum.tools.tester import TransactionFailed
 from plasma_core.transaction import Transaction
+from plasma_core.utils.transactions import MAX_MERKLE_DEPTH
+from testlang.testlang import TestingLanguage
+from testlang.tester_chain import deploy_contract, deploy_root_chain
 
 
 def test_deposit_should_succeed(testlang):
@@ -21,3 +24,24 @@ def test_deposit_zero_value_should_fail(root_chain, ethtester):
     # Submitting with zero value should fail
     with pytest.raises(TransactionFailed):
         root_chain.deposit(sender=owner.key, value=0)
+
+
+@pytest.mark.fresh_chain
+@pytest.mark.parametrize('merkle_depth', [1, MAX_MERKLE_DEPTH])
+def test_deposit_root_should_match_merkle_depth(ethtester, merkle_depth):
+    testlang = TestingLanguage(deploy_root_chain(ethtester.chain, merkle_depth), ethtester)
+    owner, amount = testlang.accounts[0], 100
+
+    # Create a deposit
+    deposit_blknum = testlang.deposit(owner, amount)
+
+    # Check that the root matches a tree of the same depth
+    assert testlang.root_chain.merkleDepth() == merkle_depth
+    assert testlang.get_plasma_block(deposit_blknum).root == testlang.child_chain.get_block(deposit_blknum).root
+
+
+@pytest.mark.fresh_chain
+@pytest.mark.parametrize('merkle_depth', [0, MAX_MERKLE_DEPTH + 1])
+def test_deploy_invalid_merkle_depth_should_fail(ethtester, merkle_depth):
+    with pytest.raises(TransactionFailed):
+        deploy_contract(ethtester.chain, 'RootChain', (merkle_depth,))
@@ -22,3 +22,39 @@ def test_process_exits_should_succeed(testlang):
     plasma_exit = testlang.get_plasma_exit(deposit_utxo_position)
     assert plasma_exit.owner == NULL_ADDRESS_HEX  # owner should be deleted
     assert plasma_exit.amount == amount  # amount should be unchanged
+
+
+def start_deposit_exits(testlang, count):
+    owner, amount = testlang.accounts[0], 100
+    utxo_positions = []
+    for _ in range(count):
+        deposit_blknum = testlang.deposit(owner, amount)
+        utxo_position = encode_utxo_position(deposit_blknum, 0, 0)
+        testlang.start_exit(owner, utxo_position)
+        utxo_positions.append(utxo_position)
+    return utxo_positions
+
+
+def test_process_exits_batch_should_stop_after_max_exits(testlang):
+    utxo_positions = start_deposit_exits(testlang, 3)
+    testlang.forward_timestamp(2 * WEEKS)
+
+    testlang.process_exits(max_exits=2)
+
+    assert [testlang.get_plasma_exit(position).owner for position in utxo_positions] == [NULL_ADDRESS_HEX, NULL_ADDRESS_HEX, testlang.accounts[0].address]
+    assert len(testlang.exit_queue) == 1
+
+    testlang.process_exits(max_exits=2)
+    assert testlang.get_plasma_exit(utxo_positions[2]).owner == NULL_ADDRESS_HEX
+    assert len(testlang.exit_queue) == 0
+
+
+def test_process_exits_in_batches_should_process_all_exits(testlang):
+    utxo_positions = start_deposit_exits(testlang, 5)
+    testlang.forward_timestamp(2 * WEEKS)
+
+    batches = testlang.process_exits_in_batches(gas_budget=1000000, gas_per_exit=400000)
+
+    assert batches == [2, 2, 1]
+    for position in utxo_positions:
+        assert testlang.get_plasma_exit(position).owner == NULL_ADDRESS_HEX
@@ -1,6 +1,8 @@
 import pytest
 from ethereum.tools.tester import TransactionFailed
-from plasma_core.utils.transactions import encode_utxo_position, decode_utxo_position
+from plasma_core.utils.transactions import encode_utxo_position, decode_utxo_position, MAX_MERKLE_DEPTH
+from testlang.testlang import TestingLanguage
+from testlang.tester_chain import deploy_root_chain
 
 
 def test_start_exit_should_succeed(testlang):
@@ -160,3 +162,88 @@ def test_start_exit_invalid_proof_should_fail(testlang):
                                       signatures,
                                       confirmations,
                                       value=bond)
+
+
+def test_start_exit_from_mempool_block_should_succeed(testlang):
+    owner, amount = testlang.accounts[0], 100
+
+    # Create deposits and spend them all in a single block
+    deposit_blknums = [testlang.deposit(owner, amount) for _ in range(3)]
+    for blknum in deposit_blknums:
+        testlang.submit_transaction([(blknum, 0, 0)], [(owner, amount)], [owner])
+    block = testlang.commit_mempool_block()
+    assert len(block.transactions) == 3
+
+    # Exit the output of the last transaction in the block
+    utxo_position = encode_utxo_position(block.number, 2, 0)
+    testlang.confirm(utxo_position, 0, owner)
+    testlang.start_exit(owner, utxo_position)
+
+    plasma_exit = testlang.get_plasma_exit(utxo_position)
+    assert plasma_exit.owner == owner.address
+    assert plasma_exit.amount == amount
+
+
+def test_start_exit_index_outside_tree_should_fail(testlang):
+    owner, amount = testlang.accounts[0], 100
+
+    # Create a deposit
+    deposit_blknum = testlang.deposit(owner, amount)
+    deposit_utxo_position = encode_utxo_position(deposit_blknum, 0, 0)
+
+    # Spend the deposit and submit the block
+    spend_utxo_position = testlang.spend_utxo(deposit_utxo_position, owner, amount, owner)
+    testlang.confirm(spend_utxo_position, 0, owner)
+
+    # Start an exit from an index that only matches the proof in its lower bits
+    bond = testlang.root_chain.EXIT_BOND()
+    (blknum, _, oindex) = decode_utxo_position(spend_utxo_position)
+    txindex = 2 ** testlang.child_chain.merkle_depth
+    with pytest.raises(TransactionFailed):
+        testlang.root_chain.startExit(blknum, txindex, oindex,
+                                      *testlang.get_exit_proof(spend_utxo_position),
+                                      value=bond)
+
+
+@pytest.mark.fresh_chain
+def test_start_exit_max_merkle_depth_should_succeed(ethtester):
+    testlang = TestingLanguage(deploy_root_chain(ethtester.chain, MAX_MERKLE_DEPTH), ethtester)
+    owner, amount = testlang.accounts[0], 100
+
+    # Create a deposit
+    deposit_blknum = testlang.deposit(owner, amount)
+    deposit_utxo_position = encode_utxo_position(deposit_blknum, 0, 0)
+
+    # Spend the deposit and submit the block
+    spend_utxo_position = testlang.spend_utxo(deposit_utxo_position, owner, amount, owner)
+    testlang.confirm(spend_utxo_position, 0, owner)
+
+    # Start an exit with a proof as deep as the tree
+    (_, proof, _, _) = testlang.get_exit_proof(spend_utxo_position)
+    assert len(proof) == MAX_MERKLE_DEPTH * 32
+    testlang.start_exit(owner, spend_utxo_position)
+
+    plasma_exit = testlang.get_plasma_exit(spend_utxo_position)
+    assert plasma_exit.owner == owner.address
+    assert plasma_exit.amount == amount
+
+
+@pytest.mark.fresh_chain
+def test_start_exit_proof_for_other_depth_should_fail(ethtester):
+    testlang = TestingLanguage(deploy_root_chain(ethtester.chain, MAX_MERKLE_DEPTH), ethtester)
+    owner, amount = testlang.accounts[0], 100
+
+    # Create a deposit
+    deposit_blknum = testlang.deposit(owner, amount)
+    deposit_utxo_position = encode_utxo_position(deposit_blknum, 0, 0)
+
+    # Start an exit with a proof cut to a shallower tree
+    bond = testlang.root_chain.EXIT_BOND()
+    (encoded_tx, proof, signatures, confirmations) = testlang.get_exit_proof(deposit_utxo_position)
+    with pytest.raises(TransactionFailed):
+        testlang.root_chain.startExit(*decode_utxo_position(deposit_utxo_position),
+                                      encoded_tx,
+                                      proof[:-32],
+                                      signatures,
+                                      confirmations,
+                                      value=bond)
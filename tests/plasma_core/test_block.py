@@ -0,0 +1,105 @@
+import pytest
+from ethereum.tools import tester
+from plasma_core.block import Block
+from plasma_core.transaction import Transaction
+from plasma_core.constants import NULL_ADDRESS
+from plasma_core.utils.transactions import MAX_MERKLE_DEPTH
+
+
+def make_transaction(amount):
+    return Transaction(inputs=[], outputs=[(NULL_ADDRESS, amount)])
+
+
+def test_merkle_is_cached():
+    block = Block(transactions=[make_transaction(1), make_transaction(2)])
+    assert block.merkle is block.merkle
+
+
+def test_merkle_rebuilt_when_transactions_replaced():
+    block = Block(transactions=[make_transaction(1)])
+    root = block.root
+
+    block.transactions = [make_transaction(2)]
+    assert block.root != root
+    assert block.root == Block(transactions=[make_transaction(2)]).root
+
+
+def test_merkle_rebuilt_when_transactions_modified():
+    block = Block(transactions=[make_transaction(1)])
+    root = block.root
+
+    block.transactions.append(make_transaction(2))
+    assert block.root != root
+    assert block.root == Block(transactions=[make_transaction(1), make_transaction(2)]).root
+
+
+def test_hash_changes_when_transaction_signed():
+    tx = Transaction(inputs=[(1, 0, 0)], outputs=[(NULL_ADDRESS, 1)])
+    block = Block(transactions=[tx])
+    block_hash = block.hash
+    root = block.root
+
+    tx.sign(0, tester.k0)
+    assert block.hash != block_hash
+    assert block.root != root
+
+
+def test_merkle_rebuilt_when_transaction_replaced_in_place():
+    block = Block(transactions=[make_transaction(1), make_transaction(2)])
+    block_hash = block.hash
+
+    block.transactions[1:] = [make_transaction(3)]
+    assert block.hash != block_hash
+    assert block.root == Block(transactions=[make_transaction(1), make_transaction(3)]).root
+
+
+def test_transaction_in_several_blocks_invalidates_each():
+    tx = Transaction(inputs=[(1, 0, 0)], outputs=[(NULL_ADDRESS, 1)])
+    blocks = [Block(transactions=[tx], number=number) for number in (1, 2)]
+    roots = [block.root for block in blocks]
+
+    tx.sign(0, tester.k0)
+    assert [block.root for block in blocks] != roots
+    assert blocks[0].root == blocks[1].root == Block(transactions=[tx]).root
+
+
+def test_hash_changes_when_number_changes():
+    block = Block(transactions=[make_transaction(1)], number=1)
+    block_hash = block.hash
+
+    block.number = 2
+    assert block.hash != block_hash
+    assert block.hash == Block(transactions=[make_transaction(1)], number=2).hash
+
+
+def test_sign_keeps_hash():
+    block = Block(transactions=[make_transaction(1)], number=1)
+    block_hash = block.hash
+
+    block.sign(tester.k0)
+    assert block.hash == block_hash
+    assert block.signer == tester.a0
+
+
+def test_merkle_depth_sets_capacity_and_proof_length():
+    block = Block(transactions=[make_transaction(1)], merkle_depth=16)
+
+    assert block.capacity == 2 ** 16
+    assert block.merkle.depth == 16
+    assert len(block.merkle.create_membership_proof(block.transactions[0].merkle_leaf_data)) == 16 * 32
+    assert block.root != Block(transactions=[make_transaction(1)]).root
+
+
+def test_merkle_rebuilt_when_depth_changes():
+    block = Block(transactions=[make_transaction(1)])
+    root = block.root
+
+    block.merkle_depth = 12
+    assert block.root == Block(transactions=[make_transaction(1)], merkle_depth=12).root
+    assert block.root != root
+
+
+@pytest.mark.parametrize("merkle_depth", [0, MAX_MERKLE_DEPTH + 1])
+def test_merkle_depth_out_of_range(merkle_depth):
+    with pytest.raises(ValueError):
+        Block(merkle_depth=merkle_depth)
@@ -0,0 +1,74 @@
+import pytest
+import rlp
+from ethereum.tools import tester
+from rlp.exceptions import DecodingError
+from plasma_core.block import Block
+from plasma_core.block_view import BlockView
+from plasma_core.transaction import Transaction
+
+
+@pytest.fixture
+def block():
+    txs = []
+    for blknum in range(1, 200):
+        tx = Transaction(inputs=[(blknum, 0, 0)], outputs=[(tester.a1, blknum), (tester.a0, 2 ** 70)])
+        tx.sign(0, tester.k0)
+        txs.append(tx)
+    block = Block(transactions=txs, number=1000)
+    block.sign(tester.k0)
+    return block
+
+
+def test_matches_decoded_block(block):
+    view = BlockView(rlp.encode(block))
+
+    assert view.number == block.number
+    assert view.signature == block.signature
+    assert view.encoded == block.encoded
+    assert view.hash == block.hash
+    assert view.signer == block.signer
+    assert view.root == block.root
+    assert not view.is_deposit_block
+    assert len(view.transactions) == len(block.transactions)
+
+
+def test_leaf_data_from_raw_bytes(block):
+    view = BlockView(rlp.encode(block))
+    for txindex, tx in enumerate(block.transactions):
+        assert view.get_merkle_leaf_data(txindex) == tx.merkle_leaf_data
+
+
+def test_transactions_decoded_on_demand(block):
+    view = BlockView(rlp.encode(block))
+    tx = view.transactions[5]
+
+    assert tx == block.transactions[5]
+    assert tx.signers == block.transactions[5].signers
+    assert view.transactions[5] is tx
+    assert view.transactions[-1] == block.transactions[-1]
+    assert list(view.transactions[:2]) == block.transactions[:2]
+    assert list(view.transactions._transactions) == [5, len(block.transactions) - 1, 0, 1]
+
+
+def test_deposit_block():
+    deposit_tx = Transaction(inputs=[], outputs=[(tester.a0, 100)])
+    block = Block(transactions=[deposit_tx], number=1)
+    view = BlockView(rlp.encode(block))
+
+    assert view.is_deposit_block
+    assert view.root == block.root
+    assert view.to_block().hash == block.hash
+
+
+def test_empty_block():
+    block = Block(number=1)
+    view = BlockView(rlp.encode(block))
+    assert len(view.transactions) == 0
+    assert view.hash == block.hash
+    assert view.root == block.root
+
+
+@pytest.mark.parametrize("data", [rlp.encode(b'block'), rlp.encode([[], 1]), rlp.encode(Block(number=1)) + b'\x00'])
+def test_invalid_encoding(data):
+    with pytest.raises(DecodingError):
+        BlockView(data)
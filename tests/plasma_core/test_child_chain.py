@@ -0,0 +1,266 @@
+import pytest
+from ethereum.tools import tester
+from plasma_core.block import Block
+from plasma_core.child_chain import ChildChain
+from plasma_core.transaction import Transaction
+from plasma_core.utils.address import address_to_hex
+from plasma_core.utils.signatures import sign
+from plasma_core.utils.transactions import encode_utxo_position
+from plasma_core.exceptions import (InvalidBlockMerkleException, InvalidBlockSignatureException,
+                                    InvalidTxSignatureException, TxAlreadySpentException)
+
+
+def add_deposit(child_chain, owner, amount):
+    blknum = child_chain.current_plasma_block_number
+    deposit_tx = Transaction(inputs=[], outputs=[(owner, amount)])
+    child_chain.add_block(Block(transactions=[deposit_tx], number=blknum))
+    return blknum
+
+
+def make_spend_block(child_chain, deposit_blknums, key):
+    spend_txs = []
+    for blknum in deposit_blknums:
+        spend_tx = Transaction(inputs=[(blknum, 0, 0)], outputs=[(tester.a1, 100)])
+        spend_tx.sign(0, key)
+        spend_txs.append(spend_tx)
+
+    block = Block(transactions=spend_txs, number=child_chain.current_plasma_block_number)
+    block.sign(tester.k0)
+    return block
+
+
+@pytest.mark.parametrize("validation_workers", [0, 2])
+def test_add_block_with_validation_workers(validation_workers):
+    child_chain = ChildChain(address_to_hex(tester.a0), validation_workers=validation_workers)
+    deposit_blknums = [add_deposit(child_chain, tester.a0, 100) for _ in range(4)]
+
+    block = make_spend_block(child_chain, deposit_blknums, tester.k0)
+    try:
+        assert child_chain.add_block(block)
+    finally:
+        child_chain.close()
+
+    assert child_chain.get_block(block.number) is block
+
+
+def test_add_block_with_validation_workers_invalid_signature():
+    child_chain = ChildChain(address_to_hex(tester.a0), validation_workers=2)
+    deposit_blknums = [add_deposit(child_chain, tester.a0, 100) for _ in range(4)]
+
+    block = make_spend_block(child_chain, deposit_blknums, tester.k1)
+    try:
+        with pytest.raises(InvalidTxSignatureException):
+            child_chain.add_block(block)
+    finally:
+        child_chain.close()
+
+
+def test_utxo_set_tracks_deposits_and_spends():
+    child_chain = ChildChain(address_to_hex(tester.a0))
+    deposit_blknums = [add_deposit(child_chain, tester.a0, 100) for _ in range(2)]
+    assert child_chain.get_balance(tester.a0) == 200
+    assert child_chain.get_utxo_positions(address_to_hex(tester.a0)) == [encode_utxo_position(blknum, 0, 0) for blknum in deposit_blknums]
+
+    block = make_spend_block(child_chain, deposit_blknums, tester.k0)
+    child_chain.add_block(block)
+
+    spend_positions = [encode_utxo_position(block.number, txindex, 0) for txindex in range(2)]
+    assert child_chain.get_balance(tester.a0) == 0
+    assert child_chain.get_utxo_positions(tester.a0) == []
+    assert child_chain.get_balance(tester.a1) == 200
+    assert child_chain.get_utxo_positions(tester.a1) == spend_positions
+    assert child_chain.get_utxo(spend_positions[1]).owner == tester.a1
+    assert child_chain.get_transaction(spend_positions[1]) is block.transactions[1]
+
+
+def test_zero_value_output_can_be_spent():
+    child_chain = ChildChain(address_to_hex(tester.a0))
+    deposit_blknum = add_deposit(child_chain, tester.a0, 100)
+
+    tx = Transaction(inputs=[(deposit_blknum, 0, 0)], outputs=[(tester.a1, 100), (tester.a0, 0)])
+    tx.sign(0, tester.k0)
+    block = Block(transactions=[tx], number=child_chain.current_plasma_block_number)
+    block.sign(tester.k0)
+    child_chain.add_block(block)
+
+    zero_position = encode_utxo_position(block.number, 0, 1)
+    assert child_chain.get_utxo_positions(tester.a0) == [zero_position]
+    assert child_chain.get_balance(tester.a0) == 0
+
+    spend_tx = Transaction(inputs=[(block.number, 0, 1)], outputs=[(tester.a1, 0)])
+    spend_tx.sign(0, tester.k0)
+    child_chain.validate_transaction(spend_tx)
+
+
+def test_double_spend_within_block_rejected():
+    child_chain = ChildChain(address_to_hex(tester.a0))
+    deposit_blknum = add_deposit(child_chain, tester.a0, 100)
+
+    block = make_spend_block(child_chain, [deposit_blknum, deposit_blknum], tester.k0)
+    with pytest.raises(TxAlreadySpentException) as e:
+        child_chain.add_block(block)
+
+    assert str(e.value).startswith('failed to validate tx 1 in block {0}:'.format(block.number))
+    assert child_chain.current_plasma_block_number == block.number
+    assert child_chain.get_balance(tester.a0) == 100
+
+
+def test_double_spend_within_transaction_rejected():
+    child_chain = ChildChain(address_to_hex(tester.a0))
+    deposit_blknum = add_deposit(child_chain, tester.a0, 100)
+
+    tx = Transaction(inputs=[(deposit_blknum, 0, 0), (deposit_blknum, 0, 0)], outputs=[(tester.a1, 200)])
+    tx.sign(0, tester.k0)
+    tx.sign(1, tester.k0)
+    with pytest.raises(TxAlreadySpentException):
+        child_chain.validate_transaction(tx)
+
+
+def test_validate_transaction_does_not_keep_state():
+    child_chain = ChildChain(address_to_hex(tester.a0))
+    deposit_blknum = add_deposit(child_chain, tester.a0, 100)
+
+    tx = make_spend_block(child_chain, [deposit_blknum], tester.k0).transactions[0]
+    child_chain.validate_transaction(tx)
+    child_chain.validate_transaction(tx)
+
+
+def test_add_blocks_in_reverse_order():
+    num_blocks = 3000
+    child_chain = ChildChain(address_to_hex(tester.a0), max_orphans=num_blocks)
+    blocks = [Block(transactions=[Transaction(inputs=[], outputs=[(tester.a0, 1)])], number=blknum)
+              for blknum in range(1, num_blocks + 1)]
+
+    for block in reversed(blocks[1:]):
+        assert not child_chain.add_block(block)
+    assert child_chain.add_block(blocks[0])
+
+    assert child_chain.current_plasma_block_number == num_blocks + 1
+    assert child_chain.get_balance(tester.a0) == num_blocks
+    assert len(child_chain.orphans) == 0
+
+
+def test_invalid_orphan_skipped():
+    child_chain = ChildChain(address_to_hex(tester.a0))
+    deposit_blknum = add_deposit(child_chain, tester.a0, 100)
+
+    # Two competing children of the next block, only the second one is valid.
+    invalid_block = make_spend_block(child_chain, [deposit_blknum], tester.k1)
+    invalid_block.number += 1
+    invalid_block.sign(tester.k0)
+    valid_block = make_spend_block(child_chain, [deposit_blknum], tester.k0)
+    valid_block.number += 1
+    valid_block.sign(tester.k0)
+    assert not child_chain.add_block(invalid_block)
+    assert not child_chain.add_block(valid_block)
+
+    assert child_chain.add_block(Block(transactions=[Transaction(inputs=[], outputs=[(tester.a0, 1)])], number=deposit_blknum + 1))
+    assert child_chain.get_block(valid_block.number) is valid_block
+    assert child_chain.current_plasma_block_number == valid_block.number + 1
+
+
+def test_orphan_with_bad_signature_does_not_block_signed_copy():
+    child_chain = ChildChain(address_to_hex(tester.a0))
+    deposit_blknum = add_deposit(child_chain, tester.a0, 100)
+
+    # Same contents, but only the second copy is signed by the operator.
+    bad_block = make_spend_block(child_chain, [deposit_blknum], tester.k0)
+    bad_block.number += 1
+    bad_block.sign(tester.k1)
+    good_block = make_spend_block(child_chain, [deposit_blknum], tester.k0)
+    good_block.number += 1
+    good_block.sign(tester.k0)
+    assert bad_block.hash == good_block.hash
+    with pytest.raises(InvalidBlockSignatureException):
+        child_chain.add_block(bad_block)
+    assert not child_chain.add_block(good_block)
+
+    assert child_chain.add_block(Block(transactions=[Transaction(inputs=[], outputs=[(tester.a0, 1)])], number=deposit_blknum + 1))
+    assert child_chain.get_block(good_block.number) is good_block
+    assert child_chain.current_plasma_block_number == good_block.number + 1
+
+
+def test_unsigned_orphans_do_not_fill_pool():
+    child_chain = ChildChain(address_to_hex(tester.a0), max_orphans=1)
+    deposit_blknum = add_deposit(child_chain, tester.a0, 100)
+
+    block = make_spend_block(child_chain, [deposit_blknum], tester.k0)
+    block.number += 1
+    for key in (tester.k1, tester.k2):
+        block.sign(key)
+        with pytest.raises(InvalidBlockSignatureException):
+            child_chain.add_block(block)
+    assert len(child_chain.orphans) == 0
+
+    block.sign(tester.k0)
+    assert not child_chain.add_block(block)
+    assert len(child_chain.orphans) == 1
+
+
+def test_deposit_ahead_of_chain_kept_in_storage():
+    child_chain = ChildChain(address_to_hex(tester.a0), max_orphans=1)
+    deposit_block = Block(transactions=[Transaction(inputs=[], outputs=[(tester.a1, 50)])], number=3)
+    assert not child_chain.add_deposit(deposit_block)
+    assert len(child_chain.orphans) == 0
+
+    # A full orphan pool doesn't affect waiting deposits.
+    child_chain.add_block(Block(transactions=[Transaction(inputs=[], outputs=[(tester.a0, 1)])], number=5))
+    add_deposit(child_chain, tester.a0, 100)
+    add_deposit(child_chain, tester.a0, 100)
+
+    assert child_chain.current_plasma_block_number == 4
+    assert child_chain.get_block(3) is deposit_block
+    assert child_chain.get_balance(tester.a1) == 50
+    assert child_chain.storage.get_deposit(3) is None
+
+
+def test_get_spending_position():
+    child_chain = ChildChain(address_to_hex(tester.a0))
+    deposit_blknum = add_deposit(child_chain, tester.a0, 100)
+    other_blknum = add_deposit(child_chain, tester.a0, 50)
+    deposit_position = encode_utxo_position(deposit_blknum, 0, 0)
+    other_position = encode_utxo_position(other_blknum, 0, 0)
+    assert child_chain.get_spending_position(deposit_position) is None
+    assert child_chain.get_challenge_data(deposit_position) is None
+
+    spend_tx = Transaction(inputs=[(other_blknum, 0, 0), (deposit_blknum, 0, 0)], outputs=[(tester.a1, 150)])
+    spend_tx.sign(0, tester.k0)
+    spend_tx.sign(1, tester.k0)
+    block = Block(transactions=[spend_tx], number=child_chain.current_plasma_block_number)
+    block.sign(tester.k0)
+    child_chain.add_block(block)
+
+    assert child_chain.get_spending_position(other_position) == encode_utxo_position(block.number, 0, 0)
+    assert child_chain.get_spending_position(deposit_position) == encode_utxo_position(block.number, 0, 1)
+
+    # A challenge needs the spend's confirmation, so there's nothing to return until one is known.
+    assert child_chain.get_challenge_data(deposit_position) is None
+    confirmation = sign(spend_tx.confirmation_hash, tester.k0)
+    child_chain.add_confirmation(encode_utxo_position(block.number, 0, 0), 1, confirmation)
+    assert child_chain.get_challenge_data(deposit_position) == (spend_tx.encoded, confirmation)
+
+
+def test_block_with_other_merkle_depth_rejected():
+    child_chain = ChildChain(address_to_hex(tester.a0), merkle_depth=12)
+    deposit_tx = Transaction(inputs=[], outputs=[(tester.a0, 100)])
+
+    with pytest.raises(InvalidBlockMerkleException):
+        child_chain.add_block(Block(transactions=[deposit_tx], number=1))
+
+    assert child_chain.add_block(Block(transactions=[deposit_tx], number=1, merkle_depth=12))
+
+
+def test_block_capacity_follows_merkle_depth():
+    txs = [Transaction(inputs=[], outputs=[(tester.a0, amount)]) for amount in range(1, 2 ** 3 + 2)]
+
+    child_chain = ChildChain(address_to_hex(tester.a0), merkle_depth=3)
+    block = Block(transactions=txs, number=1, merkle_depth=3)
+    block.sign(tester.k0)
+    with pytest.raises(InvalidBlockMerkleException):
+        child_chain.add_block(block)
+
+    child_chain = ChildChain(address_to_hex(tester.a0), merkle_depth=4)
+    block = Block(transactions=txs, number=1, merkle_depth=4)
+    block.sign(tester.k0)
+    assert child_chain.add_block(block)
+    assert child_chain.get_utxo(encode_utxo_position(1, 2 ** 3, 0)).amount == 2 ** 3 + 1
@@ -0,0 +1,64 @@
+import pytest
+from plasma_core.utils import deployer as deployer_module
+from plasma_core.utils.deployer import Deployer
+
+
+@pytest.fixture
+def compile_calls(tmp_path, monkeypatch):
+    """Runs in a temporary directory and replaces solc with a compiler that records its inputs"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(deployer_module, 'get_solc_version_string', lambda: '0.4.24')
+    monkeypatch.setattr(deployer_module, '_contract_data_cache', {})
+
+    calls = []
+
+    def compile_standard(solc_input, allow_paths=None):
+        calls.append(solc_input)
+        contract_data = {'abi': [], 'evm': {'bytecode': {'object': str(len(calls))}}}
+        return {'contracts': {file_name: {file_name.split('.')[0]: contract_data} for file_name in solc_input['sources']}}
+
+    monkeypatch.setattr(deployer_module, 'compile_standard', compile_standard)
+    return calls
+
+
+@pytest.fixture
+def contracts_dir(tmp_path):
+    contracts_dir = tmp_path / 'contracts'
+    contracts_dir.mkdir()
+    (contracts_dir / 'Token.sol').write_text('contract Token {}')
+    return contracts_dir
+
+
+def test_compile_all_skips_unchanged_sources(compile_calls, contracts_dir):
+    deployer = Deployer(str(contracts_dir))
+    assert deployer.compile_all()
+    assert not deployer.compile_all()
+    assert len(compile_calls) == 1
+    assert Deployer.get_contract_data('Token') == ([], '1')
+
+
+def test_compile_all_after_source_change(compile_calls, contracts_dir):
+    deployer = Deployer(str(contracts_dir))
+    deployer.compile_all()
+    assert Deployer.get_contract_data('Token') == ([], '1')
+
+    (contracts_dir / 'Token.sol').write_text('contract Token { uint256 x; }')
+    assert deployer.compile_all()
+    assert Deployer.get_contract_data('Token') == ([], '2')
+
+
+def test_compile_all_after_output_removed(compile_calls, contracts_dir, tmp_path):
+    deployer = Deployer(str(contracts_dir))
+    deployer.compile_all()
+
+    (tmp_path / deployer_module.OUTPUT_DIR / 'Token.json').unlink()
+    assert deployer.compile_all()
+    assert len(compile_calls) == 2
+
+
+def test_get_contract_data_cached(compile_calls, contracts_dir, tmp_path):
+    Deployer(str(contracts_dir)).compile_all()
+    contract_data = Deployer.get_contract_data('Token')
+
+    (tmp_path / deployer_module.OUTPUT_DIR / 'Token.json').unlink()
+    assert Deployer.get_contract_data('Token') is contract_data
@@ -3,6 +3,7 @@ import pytest
 from ethereum.utils import sha3
 from plasma_core.fixed_merkle import FixedMerkle
 from plasma_core.constants import NULL_HASH
+from plasma_core.exceptions import NonexistentMemberException
 
 
 def get_empty_tree_hash(depth):
@@ -54,3 +55,106 @@ def test_check_membership():
     merkle = FixedMerkle(2, leaves)
     proof = merkle.create_membership_proof(leaves[2])
     assert merkle.check_membership(leaves[2], 2, proof)
+
+
+def test_create_membership_proof_last_leaf():
+    depth = 4
+    leaves = [bytes([i]) for i in range(2 ** depth)]
+    merkle = FixedMerkle(depth, leaves)
+    proof = merkle.create_membership_proof(leaves[-1])
+    assert proof[:32] == sha3(leaves[-2])
+    assert merkle.check_membership(leaves[-1], 2 ** depth - 1, proof)
+
+
+def test_create_membership_proof_duplicate_leaf():
+    leaves = [b'a', b'b', b'a']
+    merkle = FixedMerkle(2, leaves)
+    proof = merkle.create_membership_proof(b'a')
+    assert merkle.check_membership(b'a', 0, proof)
+
+
+def test_create_membership_proof_nonexistent_leaf():
+    with pytest.raises(NonexistentMemberException):
+        FixedMerkle(2, [b'a']).create_membership_proof(b'b')
+
+
+@pytest.mark.parametrize("depth", [1, 2, 16])
+def test_empty_sparse_tree(depth):
+    assert FixedMerkle(depth, sparse=True).root == get_empty_tree_hash(depth)
+
+
+@pytest.mark.parametrize("num_leaves", [1, 2, 3, 5, 7])
+def test_sparse_tree_matches_dense_tree(num_leaves):
+    leaves = [bytes([i]) for i in range(num_leaves)]
+    dense = FixedMerkle(3, leaves)
+    sparse = FixedMerkle(3, leaves, sparse=True)
+
+    assert sparse.root == dense.root
+    assert sparse.leaves == dense.leaves
+    for leaf in leaves + [NULL_HASH]:
+        assert sparse.create_membership_proof(leaf) == dense.create_membership_proof(leaf)
+
+
+def test_sparse_tree_stores_only_filled_nodes():
+    merkle = FixedMerkle(10, [b'a'], sparse=True)
+    assert all(len(level) <= 64 for level in merkle.tree)
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_create_membership_proofs(sparse):
+    leaves = [b'a', b'b', b'c']
+    merkle = FixedMerkle(3, leaves, sparse=sparse)
+    proofs = merkle.create_membership_proofs()
+
+    assert len(proofs) == (3 if sparse else 8)
+    for index, leaf in enumerate(leaves):
+        assert proofs[index] == merkle.create_membership_proof(leaf)
+        assert merkle.check_membership(leaf, index, proofs[index])
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+@pytest.mark.parametrize("indices", [[0], [0, 1], [2, 5], [0, 3, 4, 6], [6, 1, 3], list(range(7))])
+def test_multiproof(sparse, indices):
+    leaves = [bytes([i]) for i in range(7)]
+    merkle = FixedMerkle(3, leaves, sparse=sparse)
+    proof = merkle.create_multiproof(indices)
+    proven = [leaves[index] for index in indices]
+
+    assert merkle.check_multiproof(proven, indices, proof)
+    assert len(proof) <= len(indices) * 3 * 32
+    if len(indices) == 1:
+        assert proof == merkle.create_membership_proof(proven[0])
+
+
+def test_multiproof_shares_siblings():
+    leaves = [bytes([i]) for i in range(16)]
+    merkle = FixedMerkle(4, leaves)
+    assert len(merkle.create_multiproof([0, 1, 2, 3])) == 2 * 32
+    assert len(merkle.create_multiproof(list(range(16)))) == 0
+
+
+def test_multiproof_empty_leaf_in_sparse_tree():
+    merkle = FixedMerkle(3, [b'a'], sparse=True)
+    proof = merkle.create_multiproof([0, 5])
+    assert merkle.check_multiproof([b'a', NULL_HASH], [0, 5], proof)
+
+
+def test_check_multiproof_invalid():
+    leaves = [bytes([i]) for i in range(4)]
+    merkle = FixedMerkle(2, leaves)
+    proof = merkle.create_multiproof([0, 2])
+
+    assert not merkle.check_multiproof([leaves[0], leaves[3]], [0, 2], proof)
+    assert not merkle.check_multiproof([leaves[0], leaves[2]], [0, 3], proof)
+    assert not merkle.check_multiproof([leaves[0], leaves[2]], [0, 2], proof[:-32])
+    assert not merkle.check_multiproof([leaves[0], leaves[2]], [0, 2], proof + proof[:32])
+    assert not merkle.check_multiproof([leaves[0], leaves[1]], [0, 0], proof)
+    assert not merkle.check_multiproof([], [], b'')
+
+
+def test_create_multiproof_invalid_indices():
+    merkle = FixedMerkle(2, [b'a'])
+    with pytest.raises(ValueError):
+        merkle.create_multiproof([])
+    with pytest.raises(NonexistentMemberException):
+        merkle.create_multiproof([4])
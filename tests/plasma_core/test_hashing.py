@@ -0,0 +1,46 @@
+import pytest
+from ethereum.utils import sha3
+from plasma_core.utils import hashing
+
+
+EMPTY_KECCAK = bytes.fromhex('c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470')
+
+
+@pytest.fixture
+def restore_backend():
+    name = hashing.backend.name
+    yield
+    hashing.set_backend(name)
+
+
+@pytest.mark.parametrize('name', hashing.get_available_backends())
+def test_backends_match_pyethereum(name):
+    backend = hashing.load_backend(name)
+    inputs = [b'', b'\x01' * 64, bytes(range(200))]
+
+    assert backend.keccak(b'') == EMPTY_KECCAK
+    assert backend.keccak_batch(inputs) == [sha3(data) for data in inputs]
+
+
+def test_fastest_backend_selected():
+    assert hashing.backend.name == hashing.get_available_backends()[0]
+
+
+def test_set_backend(restore_backend):
+    hashing.set_backend('pyethereum')
+
+    assert hashing.backend.name == 'pyethereum'
+    assert hashing.keccak(b'') == EMPTY_KECCAK
+
+
+def test_set_unknown_backend(restore_backend):
+    with pytest.raises(ValueError):
+        hashing.set_backend('sha256')
+
+
+def test_keccak_chunks():
+    data = bytes(range(160))
+    chunks = [data[0:64], data[64:128], data[128:160]]
+
+    assert hashing.keccak_chunks(data, 64) == b''.join(sha3(chunk) for chunk in chunks)
+    assert hashing.keccak_chunks(b'', 64) == b''
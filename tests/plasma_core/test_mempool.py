@@ -0,0 +1,96 @@
+import pytest
+from ethereum.tools import tester
+from plasma_core.block import Block
+from plasma_core.child_chain import ChildChain
+from plasma_core.mempool import Mempool
+from plasma_core.transaction import Transaction
+from plasma_core.utils.address import address_to_hex
+from plasma_core.exceptions import (DepositTxException,
+                                    DuplicateTxException,
+                                    TxAlreadySpentException)
+
+
+@pytest.fixture
+def child_chain():
+    child_chain = ChildChain(address_to_hex(tester.a0))
+    for blknum in range(1, 4):
+        deposit_tx = Transaction(inputs=[], outputs=[(tester.a0, 100)])
+        child_chain.add_block(Block(transactions=[deposit_tx], number=blknum))
+    return child_chain
+
+
+def make_spend(blknum, amount=100):
+    tx = Transaction(inputs=[(blknum, 0, 0)], outputs=[(tester.a1, amount)])
+    tx.sign(0, tester.k0)
+    return tx
+
+
+def test_build_block(child_chain):
+    mempool = Mempool(child_chain)
+    txs = [make_spend(blknum) for blknum in range(1, 4)]
+    for tx in txs:
+        mempool.add_transaction(tx)
+
+    block = mempool.build_block()
+    assert block.number == child_chain.current_plasma_block_number
+    assert block.transactions == txs
+
+
+def test_build_block_respects_capacity(child_chain):
+    mempool = Mempool(child_chain, capacity=2)
+    txs = [make_spend(blknum) for blknum in range(1, 4)]
+    for tx in txs:
+        mempool.add_transaction(tx)
+
+    block = mempool.build_block()
+    assert block.transactions == txs[:2]
+
+    block.sign(tester.k0)
+    child_chain.add_block(block)
+    mempool.remove_block(block)
+    assert len(mempool) == 1
+    assert mempool.build_block().transactions == txs[2:]
+
+
+def test_double_spend_of_pending_input_rejected(child_chain):
+    mempool = Mempool(child_chain)
+    mempool.add_transaction(make_spend(1))
+
+    with pytest.raises(TxAlreadySpentException):
+        mempool.add_transaction(make_spend(1, amount=50))
+
+
+def test_duplicate_rejected(child_chain):
+    mempool = Mempool(child_chain)
+    tx = make_spend(1)
+    mempool.add_transaction(tx)
+
+    with pytest.raises(DuplicateTxException):
+        mempool.add_transaction(tx)
+
+
+def test_deposit_rejected(child_chain):
+    mempool = Mempool(child_chain)
+
+    with pytest.raises(DepositTxException):
+        mempool.add_transaction(Transaction(inputs=[], outputs=[(tester.a0, 100)]))
+
+
+def test_spent_inputs_released_after_block(child_chain):
+    mempool = Mempool(child_chain)
+    mempool.add_transaction(make_spend(1))
+
+    block = mempool.build_block()
+    block.sign(tester.k0)
+    child_chain.add_block(block)
+    mempool.remove_block(block)
+    assert mempool.spent == {}
+
+    # The input is now spent on the chain instead.
+    with pytest.raises(TxAlreadySpentException):
+        mempool.add_transaction(make_spend(1, amount=50))
+
+
+def test_capacity_defaults_to_block_capacity():
+    assert Mempool(ChildChain(address_to_hex(tester.a0))).capacity == Block.CAPACITY
+    assert Mempool(ChildChain(address_to_hex(tester.a0), merkle_depth=16)).capacity == 2 ** 16
@@ -0,0 +1,60 @@
+import pytest
+from ethereum.tools import tester
+from plasma_core.block import Block
+from plasma_core.orphan_pool import OrphanPool
+from plasma_core.transaction import Transaction
+from plasma_core.constants import NULL_ADDRESS
+
+
+def make_block(number, amount=1):
+    return Block(transactions=[Transaction(inputs=[], outputs=[(NULL_ADDRESS, amount)])], number=number)
+
+
+def test_add_and_pop():
+    pool = OrphanPool(10)
+    blocks = [make_block(2, amount) for amount in (1, 2)]
+    for block in blocks:
+        assert pool.add(block)
+
+    assert len(pool) == 2
+    assert pool.pop(2) == blocks
+    assert pool.pop(2) == []
+    assert len(pool) == 0
+
+
+def test_duplicate_rejected():
+    pool = OrphanPool(10)
+    assert pool.add(make_block(2))
+    assert not pool.add(make_block(2))
+    assert len(pool) == 1
+
+
+def test_differently_signed_copies_kept():
+    pool = OrphanPool(10)
+    bad_block = make_block(2)
+    bad_block.sign(tester.k1)
+    good_block = make_block(2)
+    good_block.sign(tester.k0)
+
+    assert pool.add(bad_block)
+    assert pool.add(good_block)
+    assert pool.pop(2) == [bad_block, good_block]
+
+
+def test_evicts_highest_block():
+    pool = OrphanPool(2)
+    assert pool.add(make_block(5))
+    assert pool.add(make_block(3))
+
+    # Blocks further ahead than everything in a full pool are rejected.
+    assert not pool.add(make_block(6))
+
+    assert pool.add(make_block(4))
+    assert len(pool) == 2
+    assert pool.pop(5) == []
+    assert [block.number for block in pool.pop(3) + pool.pop(4)] == [3, 4]
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError):
+        OrphanPool(0)
@@ -0,0 +1,78 @@
+import pytest
+from ethereum.tools import tester
+from plasma_core.block import Block
+from plasma_core.child_chain import ChildChain
+from plasma_core.proof_cache import ProofCache
+from plasma_core.transaction import Transaction
+from plasma_core.utils.address import address_to_hex
+from plasma_core.utils.transactions import encode_utxo_position
+
+
+@pytest.fixture
+def child_chain():
+    child_chain = ChildChain(address_to_hex(tester.a0))
+    for blknum in range(1, 4):
+        deposit_tx = Transaction(inputs=[], outputs=[(tester.a0, blknum)])
+        child_chain.add_block(Block(transactions=[deposit_tx], number=blknum))
+
+    spends = []
+    for blknum in range(1, 4):
+        spend_tx = Transaction(inputs=[(blknum, 0, 0)], outputs=[(tester.a1, blknum)])
+        spend_tx.sign(0, tester.k0)
+        spends.append(spend_tx)
+    block = Block(transactions=spends, number=4)
+    block.sign(tester.k0)
+    child_chain.add_block(block)
+    return child_chain
+
+
+def test_get_proof(child_chain):
+    proofs = ProofCache(child_chain)
+    block = child_chain.get_block(4)
+
+    for txindex, tx in enumerate(block.transactions):
+        proof = proofs.get_proof_for_position(encode_utxo_position(4, txindex, 0))
+        assert proof == block.merkle.create_membership_proof(tx.merkle_leaf_data)
+        assert block.merkle.check_membership(tx.merkle_leaf_data, txindex, proof)
+    assert 4 in proofs
+    assert proofs.size == 3 * 32 * Block.MERKLE_DEPTH
+
+
+def test_precompute(child_chain):
+    proofs = ProofCache(child_chain)
+    block = child_chain.get_block(4)
+    assert proofs.precompute(block) == block.merkle.create_membership_proofs()
+    assert len(proofs) == 1
+
+
+def test_evicts_least_recently_used(child_chain):
+    proof_size = 32 * Block.MERKLE_DEPTH
+    proofs = ProofCache(child_chain, max_bytes=2 * proof_size)
+    proofs.get_proof(1, 0)
+    proofs.get_proof(2, 0)
+    proofs.get_proof(1, 0)
+    proofs.get_proof(3, 0)
+
+    assert 1 in proofs
+    assert 2 not in proofs
+    assert 3 in proofs
+    assert proofs.size == 2 * proof_size
+
+
+def test_oversized_block_not_cached(child_chain):
+    proofs = ProofCache(child_chain, max_bytes=2 * 32 * Block.MERKLE_DEPTH)
+    proofs.get_proof(1, 0)
+
+    block = child_chain.get_block(4)
+    assert proofs.get_proof(4, 2) == block.merkle.create_membership_proof(block.transactions[2].merkle_leaf_data)
+    assert 4 not in proofs
+    assert 1 in proofs
+
+
+def test_discard(child_chain):
+    proofs = ProofCache(child_chain)
+    proofs.get_proof(1, 0)
+    proofs.discard(1)
+    proofs.discard(2)
+    assert len(proofs) == 0
+    assert proofs.size == 0
@@ -0,0 +1,157 @@
+import os
+import pytest
+from ethereum.tools import tester
+from web3 import Web3
+from plasma_core.block import Block
+from plasma_core.child_chain import ChildChain
+from plasma_core.root_chain_ingester import RootChainIngester
+from plasma_core.transaction import Transaction
+from plasma_core.utils.address import address_to_hex
+from plasma_core.utils.transactions import encode_utxo_position
+from plasma_core.exceptions import InvalidBlockMerkleException
+
+
+CONTRACTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../plasma/contracts'))
+
+# Events emitted by RootChain.sol.
+ROOT_CHAIN_EVENTS = [
+    {'type': 'event', 'name': 'DepositCreated', 'anonymous': False, 'inputs': [
+        {'name': 'owner', 'type': 'address', 'indexed': True},
+        {'name': 'amount', 'type': 'uint256', 'indexed': False},
+        {'name': 'depositBlock', 'type': 'uint256', 'indexed': False},
+    ]},
+    {'type': 'event', 'name': 'PlasmaBlockRootCommitted', 'anonymous': False, 'inputs': [
+        {'name': 'blockNumber', 'type': 'uint256', 'indexed': False},
+        {'name': 'root', 'type': 'bytes32', 'indexed': False},
+    ]},
+    {'type': 'event', 'name': 'ExitStarted', 'anonymous': False, 'inputs': [
+        {'name': 'owner', 'type': 'address', 'indexed': True},
+        {'name': 'utxoPosition', 'type': 'uint256', 'indexed': False},
+        {'name': 'amount', 'type': 'uint256', 'indexed': False},
+    ]},
+]
+
+
+@pytest.fixture
+def child_chain():
+    return ChildChain(address_to_hex(tester.a0))
+
+
+@pytest.fixture
+def ingester(child_chain):
+    w3 = Web3()
+    return RootChainIngester(w3, w3.eth.contract(abi=ROOT_CHAIN_EVENTS), child_chain)
+
+
+def make_spend_block(blknum, spent_blknum):
+    spend_tx = Transaction(inputs=[(spent_blknum, 0, 0)], outputs=[(tester.a1, 100)])
+    spend_tx.sign(0, tester.k0)
+    block = Block(transactions=[spend_tx], number=blknum)
+    block.sign(tester.k0)
+    return block
+
+
+def test_handle_deposit(ingester, child_chain):
+    ingester.handle_event({'event': 'DepositCreated', 'args': {'owner': address_to_hex(tester.a0), 'amount': 100, 'depositBlock': 1}})
+    ingester.handle_event({'event': 'DepositCreated', 'args': {'owner': address_to_hex(tester.a0), 'amount': 100, 'depositBlock': 1}})
+
+    assert child_chain.current_plasma_block_number == 2
+    assert child_chain.get_balance(tester.a0) == 100
+
+
+def test_handle_deposit_ahead_of_chain(ingester, child_chain):
+    ingester.handle_event({'event': 'DepositCreated', 'args': {'owner': address_to_hex(tester.a1), 'amount': 50, 'depositBlock': 2}})
+    assert child_chain.current_plasma_block_number == 1
+    assert len(child_chain.orphans) == 0
+
+    ingester.handle_event({'event': 'DepositCreated', 'args': {'owner': address_to_hex(tester.a0), 'amount': 100, 'depositBlock': 1}})
+    assert child_chain.current_plasma_block_number == 3
+    assert child_chain.get_balance(tester.a1) == 50
+
+
+def test_handle_root(ingester, child_chain):
+    ingester.handle_event({'event': 'DepositCreated', 'args': {'owner': address_to_hex(tester.a0), 'amount': 100, 'depositBlock': 1}})
+    block = make_spend_block(2, 1)
+    ingester.handle_event({'event': 'PlasmaBlockRootCommitted', 'args': {'blockNumber': 2, 'root': block.root}})
+
+    assert child_chain.add_block(block)
+    assert child_chain.get_balance(tester.a1) == 100
+
+
+def test_block_not_matching_root_rejected(ingester, child_chain):
+    ingester.handle_event({'event': 'DepositCreated', 'args': {'owner': address_to_hex(tester.a0), 'amount': 100, 'depositBlock': 1}})
+    ingester.handle_event({'event': 'PlasmaBlockRootCommitted', 'args': {'blockNumber': 2, 'root': b'\x01' * 32}})
+
+    with pytest.raises(InvalidBlockMerkleException):
+        child_chain.add_block(make_spend_block(2, 1))
+    assert child_chain.current_plasma_block_number == 2
+
+
+def test_root_not_matching_existing_block(ingester, child_chain):
+    ingester.handle_event({'event': 'DepositCreated', 'args': {'owner': address_to_hex(tester.a0), 'amount': 100, 'depositBlock': 1}})
+    child_chain.add_block(make_spend_block(2, 1))
+
+    with pytest.raises(InvalidBlockMerkleException):
+        ingester.handle_event({'event': 'PlasmaBlockRootCommitted', 'args': {'blockNumber': 2, 'root': b'\x01' * 32}})
+
+
+def test_handle_exit(ingester):
+    utxo_position = encode_utxo_position(1, 0, 0)
+    ingester.handle_event({'event': 'ExitStarted', 'args': {'owner': address_to_hex(tester.a0), 'utxoPosition': utxo_position, 'amount': 100}})
+    assert ingester.exits[utxo_position] == (tester.a0, 100)
+    assert utxo_position not in ingester.challenges
+
+
+def test_sync_with_eth_tester(child_chain):
+    eth_tester = pytest.importorskip('eth_tester')
+    from web3.providers.eth_tester import EthereumTesterProvider
+    from plasma_core.utils.deployer import Deployer
+
+    w3 = Web3(EthereumTesterProvider(eth_tester.EthereumTester()))
+    deployer = Deployer(CONTRACTS_DIR, w3=w3)
+    try:
+        root_chain = deployer.deploy_contract('RootChain', args=(Block.MERKLE_DEPTH,), concise=False)
+    except FileNotFoundError:
+        pytest.skip('contracts have not been compiled')
+
+    (operator, owner) = w3.eth.accounts[:2]
+    child_chain = ChildChain(operator)
+    ingester = RootChainIngester(w3, root_chain, child_chain, batch_size=2)
+
+    root_chain.functions.deposit().transact({'from': owner, 'value': 100})
+    block = Block(transactions=[Transaction(inputs=[(1, 0, 0)], outputs=[(owner, 100)])], number=2)
+    root_chain.functions.commitPlasmaBlockRoot(block.root).transact({'from': operator})
+    root_chain.functions.deposit().transact({'from': owner, 'value': 50})
+    ingester.run_until_synced()
+
+    assert child_chain.current_plasma_block_number == 2
+    assert child_chain.storage.get_root(2) == block.root
+    assert ingester.next_block == w3.eth.blockNumber + 1
+
+    # Deposits after the committed block wait until the operator's block arrives.
+    assert len(child_chain.orphans) == 1
+    ingester.run_until_synced()
+    assert len(child_chain.orphans) == 1
+
+
+def test_handle_exit_of_spent_output(ingester, child_chain):
+    ingester.handle_event({'event': 'DepositCreated', 'args': {'owner': address_to_hex(tester.a0), 'amount': 100, 'depositBlock': 1}})
+    block = make_spend_block(2, 1)
+    child_chain.add_block(block)
+    block.transactions[0].confirm(0, tester.k0)
+    child_chain.add_confirmation(encode_utxo_position(2, 0, 0), 0, block.transactions[0].confirmations[0])
+
+    utxo_position = encode_utxo_position(1, 0, 0)
+    ingester.handle_event({'event': 'ExitStarted', 'args': {'owner': address_to_hex(tester.a0), 'utxoPosition': utxo_position, 'amount': 100}})
+    assert ingester.challenges[utxo_position] == (block.transactions[0].encoded, block.transactions[0].confirmations[0])
+
+
+def test_handle_exit_of_unconfirmed_spend(ingester, child_chain):
+    ingester.handle_event({'event': 'DepositCreated', 'args': {'owner': address_to_hex(tester.a0), 'amount': 100, 'depositBlock': 1}})
+    child_chain.add_block(make_spend_block(2, 1))
+
+    # Without the spend's confirmation a challenge would be rejected, so none is recorded.
+    utxo_position = encode_utxo_position(1, 0, 0)
+    ingester.handle_event({'event': 'ExitStarted', 'args': {'owner': address_to_hex(tester.a0), 'utxoPosition': utxo_position, 'amount': 100}})
+    assert utxo_position in ingester.exits
+    assert utxo_position not in ingester.challenges
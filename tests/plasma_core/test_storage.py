@@ -0,0 +1,166 @@
+import pytest
+from ethereum.tools import tester
+from plasma_core.block import Block
+from plasma_core.block_view import BlockView
+from plasma_core.child_chain import ChildChain
+from plasma_core.storage import SQLiteStorage
+from plasma_core.transaction import Transaction
+from plasma_core.utils.address import address_to_hex
+from plasma_core.utils.signatures import sign
+from plasma_core.utils.transactions import decode_utxo_position, encode_utxo_position
+
+
+def open_child_chain(path):
+    return ChildChain(address_to_hex(tester.a0), storage=SQLiteStorage(path))
+
+
+def add_deposit(child_chain, owner, amount):
+    blknum = child_chain.current_plasma_block_number
+    deposit_tx = Transaction(inputs=[], outputs=[(owner, amount)])
+    child_chain.add_block(Block(transactions=[deposit_tx], number=blknum))
+    return blknum
+
+
+def add_spend(child_chain, utxo_position, new_owner, amount, key):
+    spend_tx = Transaction(inputs=[decode_utxo_position(utxo_position)], outputs=[(new_owner, amount)])
+    spend_tx.sign(0, key)
+    block = Block(transactions=[spend_tx], number=child_chain.current_plasma_block_number)
+    block.sign(tester.k0)
+    child_chain.add_block(block)
+    return block
+
+
+def test_reopen_restores_chain(tmp_path):
+    path = str(tmp_path / 'chain.db')
+
+    child_chain = open_child_chain(path)
+    deposit_blknum = add_deposit(child_chain, tester.a0, 100)
+    block = add_spend(child_chain, encode_utxo_position(deposit_blknum, 0, 0), tester.a1, 100, tester.k0)
+    child_chain.close()
+
+    child_chain = open_child_chain(path)
+    assert child_chain.current_plasma_block_number == block.number + 1
+    assert child_chain.get_balance(tester.a0) == 0
+    assert child_chain.get_utxo_positions(tester.a1) == [encode_utxo_position(block.number, 0, 0)]
+
+    stored_block = child_chain.get_block(block.number)
+    assert stored_block.hash == block.hash
+    assert stored_block.signature == block.signature
+    assert stored_block.root == block.root
+    assert stored_block.transactions[0].signers == block.transactions[0].signers
+    assert child_chain.get_spending_position(encode_utxo_position(deposit_blknum, 0, 0)) == encode_utxo_position(block.number, 0, 0)
+    child_chain.close()
+
+
+def test_reopened_chain_accepts_new_blocks(tmp_path):
+    path = str(tmp_path / 'chain.db')
+
+    child_chain = open_child_chain(path)
+    deposit_blknum = add_deposit(child_chain, tester.a0, 100)
+    child_chain.close()
+
+    child_chain = open_child_chain(path)
+    block = add_spend(child_chain, encode_utxo_position(deposit_blknum, 0, 0), tester.a1, 100, tester.k0)
+    assert child_chain.get_block(block.number).hash == block.hash
+    assert child_chain.get_balance(tester.a1) == 100
+    child_chain.close()
+
+
+def test_lazy_blocks(tmp_path):
+    path = str(tmp_path / 'chain.db')
+
+    child_chain = ChildChain(address_to_hex(tester.a0), storage=SQLiteStorage(path, lazy_blocks=True))
+    deposit_blknum = add_deposit(child_chain, tester.a0, 100)
+    block = add_spend(child_chain, encode_utxo_position(deposit_blknum, 0, 0), tester.a1, 100, tester.k0)
+
+    stored_block = child_chain.get_block(block.number)
+    assert isinstance(stored_block, BlockView)
+    assert stored_block.root == block.root
+    assert child_chain.get_transaction(encode_utxo_position(block.number, 0, 0)) == block.transactions[0]
+    child_chain.close()
+
+
+def test_meta_and_roots_persist(tmp_path):
+    path = str(tmp_path / 'chain.db')
+
+    storage = SQLiteStorage(path)
+    assert storage.get_meta('checkpoint') is None
+    assert storage.get_meta('checkpoint', 0) == 0
+    storage.set_meta('checkpoint', 10)
+    storage.add_root(2, b'\x01' * 32)
+    storage.close()
+
+    storage = SQLiteStorage(path)
+    assert storage.get_meta('checkpoint') == 10
+    assert storage.get_root(2) == b'\x01' * 32
+    assert storage.get_root(3) is None
+    assert storage.get_head() == 1
+    storage.close()
+
+
+def test_waiting_deposits_persist(tmp_path):
+    path = str(tmp_path / 'chain.db')
+
+    child_chain = open_child_chain(path)
+    deposit_tx = Transaction(inputs=[], outputs=[(tester.a1, 50)])
+    assert not child_chain.add_deposit(Block(transactions=[deposit_tx], number=2))
+    child_chain.close()
+
+    child_chain = open_child_chain(path)
+    add_deposit(child_chain, tester.a0, 100)
+    assert child_chain.current_plasma_block_number == 3
+    assert child_chain.get_balance(tester.a1) == 50
+    assert child_chain.storage.get_deposit(2) is None
+    child_chain.close()
+
+
+def test_merkle_depth_persists(tmp_path):
+    path = str(tmp_path / 'chain.db')
+
+    child_chain = ChildChain(address_to_hex(tester.a0), storage=SQLiteStorage(path, merkle_depth=16), merkle_depth=16)
+    deposit_tx = Transaction(inputs=[], outputs=[(tester.a0, 100)])
+    block = Block(transactions=[deposit_tx], number=1, merkle_depth=16)
+    child_chain.add_block(block)
+    child_chain.close()
+
+    for lazy_blocks in (False, True):
+        storage = SQLiteStorage(path, lazy_blocks=lazy_blocks, merkle_depth=16)
+        assert storage.get_block(1).root == block.root
+        storage.close()
+
+    with pytest.raises(ValueError):
+        SQLiteStorage(path)
+
+
+@pytest.mark.parametrize('lazy_blocks', [False, True])
+def test_challenge_data_uses_stored_confirmations(tmp_path, lazy_blocks):
+    path = str(tmp_path / 'chain.db')
+
+    child_chain = ChildChain(address_to_hex(tester.a0), storage=SQLiteStorage(path, lazy_blocks=lazy_blocks))
+    deposit_position = encode_utxo_position(add_deposit(child_chain, tester.a0, 100), 0, 0)
+    block = add_spend(child_chain, deposit_position, tester.a1, 100, tester.k0)
+    spend_position = encode_utxo_position(block.number, 0, 0)
+
+    # Confirming a decoded copy isn't enough, the confirmation has to be stored.
+    child_chain.get_transaction(spend_position).confirm(0, tester.k0)
+    assert child_chain.get_challenge_data(deposit_position) is None
+
+    confirmation = sign(block.transactions[0].confirmation_hash, tester.k0)
+    child_chain.add_confirmation(spend_position, 0, confirmation)
+    child_chain.close()
+
+    child_chain = ChildChain(address_to_hex(tester.a0), storage=SQLiteStorage(path, lazy_blocks=lazy_blocks))
+    assert child_chain.get_challenge_data(deposit_position) == (block.transactions[0].encoded, confirmation)
+    assert child_chain.get_transaction(spend_position).confirmations[0] == confirmation
+    child_chain.close()
+
+
+def test_child_chain_merkle_depth_must_match_storage(tmp_path):
+    path = str(tmp_path / 'chain.db')
+
+    with pytest.raises(ValueError):
+        ChildChain(address_to_hex(tester.a0), storage=SQLiteStorage(path), merkle_depth=16)
+
+    child_chain = ChildChain(address_to_hex(tester.a0), storage=SQLiteStorage(str(tmp_path / 'deep.db'), merkle_depth=16))
+    assert child_chain.merkle_depth == 16
+    child_chain.close()
@@ -0,0 +1,142 @@
+import pytest
+import rlp
+from ethereum.tools import tester
+from plasma_core.block import Block
+from plasma_core.transaction import Transaction
+from plasma_core.constants import NULL_ADDRESS
+import plasma_core.transaction
+
+
+def test_signers_recovered_once(monkeypatch):
+    tx = Transaction(inputs=[(1, 0, 0)], outputs=[(tester.a1, 100)])
+    tx.sign(0, tester.k0)
+
+    calls = []
+    get_signer = plasma_core.transaction.get_signer
+
+    def counting_get_signer(tx_hash, signature):
+        calls.append(signature)
+        return get_signer(tx_hash, signature)
+
+    monkeypatch.setattr(plasma_core.transaction, 'get_signer', counting_get_signer)
+
+    assert tx.signers == [tester.a0, NULL_ADDRESS]
+    assert tx.signers == [tester.a0, NULL_ADDRESS]
+    assert len(calls) == 1
+
+
+def test_sign_invalidates_signers():
+    tx = Transaction(inputs=[(1, 0, 0), (2, 0, 0)], outputs=[(tester.a1, 100)])
+    tx.sign(0, tester.k0)
+    assert tx.signers == [tester.a0, NULL_ADDRESS]
+
+    tx.sign(0, tester.k1)
+    tx.sign(1, tester.k2)
+    assert tx.signers == [tester.a1, tester.a2]
+
+
+def test_sign_keeps_hash():
+    tx = Transaction(inputs=[(1, 0, 0)], outputs=[(tester.a1, 100)])
+    tx_hash = tx.hash
+    leaf_data = tx.merkle_leaf_data
+
+    tx.sign(0, tester.k0)
+    assert tx.hash == tx_hash
+    assert tx.merkle_leaf_data != leaf_data
+    assert tx.merkle_leaf_data == tx.encoded + tx.signatures[0] + tx.signatures[1]
+
+
+def test_signatures_cannot_change_in_place():
+    tx = Transaction(inputs=[(1, 0, 0)], outputs=[(tester.a1, 100)])
+    tx.sign(0, tester.k0)
+    block = Block(transactions=[tx])
+    root = block.root
+
+    with pytest.raises(TypeError):
+        tx.signatures[0] = tx.signatures[1]
+    with pytest.raises(TypeError):
+        tx.confirmations[0] = tx.signatures[0]
+
+    tx.signatures = [tx.signatures[1], tx.signatures[1]]
+    assert block.root != root
+    assert block.root == Block(transactions=[Transaction(inputs=[(1, 0, 0)], outputs=[(tester.a1, 100)])]).root
+
+
+def test_assigned_inputs_and_outputs_are_padded_tuples():
+    tx = Transaction(inputs=[(1, 0, 0)], outputs=[(tester.a1, 100)])
+    block = Block(transactions=[tx])
+    root = block.root
+
+    tx.inputs = [(2, 0, 0)]
+    tx.outputs = [(tester.a1, 5)]
+    expected = Transaction(inputs=[(2, 0, 0)], outputs=[(tester.a1, 5)])
+    assert tx.hash == expected.hash
+    assert block.root != root
+    assert block.root == Block(transactions=[expected]).root
+    assert tx.outputs[1] is plasma_core.transaction.NULL_OUTPUT
+
+    with pytest.raises(TypeError):
+        tx.outputs[0] = (tester.a1, 500)
+    with pytest.raises(TypeError):
+        tx.inputs[0] = (3, 0, 0)
+
+
+def test_sign_invalid_index():
+    tx = Transaction(inputs=[(1, 0, 0)], outputs=[(tester.a1, 100)])
+    with pytest.raises(IndexError):
+        tx.sign(2, tester.k0)
+
+
+def test_field_assignment_clears_hash():
+    tx = Transaction(inputs=[(1, 0, 0)], outputs=[(tester.a1, 100)])
+    tx_hash = tx.hash
+    confirmation_hash = tx.confirmation_hash
+
+    tx.outputs = Transaction(inputs=[(1, 0, 0)], outputs=[(tester.a1, 50)]).outputs
+    assert tx.hash != tx_hash
+    assert tx.confirmation_hash != confirmation_hash
+    assert tx.hash == Transaction(inputs=[(1, 0, 0)], outputs=[(tester.a1, 50)]).hash
+
+
+def test_confirm_updates_joined_confirmations():
+    tx = Transaction(inputs=[(1, 0, 0)], outputs=[(tester.a1, 100)])
+    joined_confirmations = tx.joined_confirmations
+
+    tx.confirm(0, tester.k0)
+    assert tx.joined_confirmations != joined_confirmations
+    assert tx.joined_confirmations == tx.confirmations[0] + tx.confirmations[1]
+
+
+def test_listeners_notified_of_leaf_changes_only():
+    tx = Transaction(inputs=[(1, 0, 0)], outputs=[(tester.a1, 100)])
+    blocks = [Block(transactions=[tx]) for _ in range(3)]
+    merkle = blocks[0].merkle
+    del blocks[1:]
+
+    tx.confirm(0, tester.k0)
+    assert blocks[0].merkle is merkle
+
+    tx.sign(0, tester.k0)
+    assert blocks[0].merkle is not merkle
+    assert len(tx._listeners) == 1
+
+
+def test_deposit_encoding_matches_contract():
+    tx = Transaction(inputs=[], outputs=[(tester.a1, 1)])
+
+    # Constant inputs and second output used by PlasmaUtils.getDepositTransaction.
+    encoded_inputs = b'\xc8\xc3\x80\x80\x80\xc3\x80\x80\x80'
+    encoded_first_output = b'\xd6\x94' + tester.a1 + b'\x01'
+    encoded_second_output = b'\xd6\x94' + NULL_ADDRESS + b'\x80'
+    encoded_outputs = b'\xee' + encoded_first_output + encoded_second_output
+    assert tx.encoded == b'\xf8\x38' + encoded_inputs + encoded_outputs
+
+
+def test_decode_round_trip():
+    tx = Transaction(inputs=[(1, 2, 1)], outputs=[(tester.a1, 100), (tester.a2, 5)])
+    tx.sign(0, tester.k0)
+
+    decoded = Transaction.deserialize(rlp.decode(rlp.encode(tx, Transaction)))
+    assert decoded == tx
+    assert decoded.inputs[0].position == tx.inputs[0].position
+    assert decoded.outputs == tx.outputs